@@ -0,0 +1,30 @@
+"""
+Production launcher: python -m obsidian_api.app
+
+uvicorn's "auto" loop/http pick uvloop and httptools (both in uvicorn[standard])
+and fall back to asyncio/h11 where they are unavailable, e.g. uvloop on Windows.
+"""
+
+from __future__ import annotations
+
+import os
+
+import uvicorn
+
+
+def main() -> None:
+    uvicorn.run(
+        "obsidian_api.app.main:app",
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", "8787")),
+        loop="auto",
+        http="auto",
+        # Each worker is a separate process with its own caches (notes, HTML, resolve)
+        workers=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))),
+        limit_concurrency=int(os.getenv("LIMIT_CONCURRENCY", "200")),
+        access_log=os.getenv("ACCESS_LOG", "false").lower() == "true",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import os
 from pathlib import Path
 from typing import Optional, Literal
@@ -9,8 +8,8 @@ from pydantic import BaseModel, Field
 
 from .intent import detect_intent, Intent
 from .resolver import resolve_query
-from .vault import safe_join, parse_frontmatter, extract_section
-from .table_extractor import extract_tables
+from .vault import safe_join, read_note, extract_section_cached
+from .table_extractor import extract_tables_cached
 from .search import grep_vault
 
 try:
@@ -79,9 +78,8 @@ def plan_with_llm(query: str) -> Optional[Plan]:
                 instructions=instructions,
             )
             raw = getattr(resp, "output_text", "") or ""
-            # Expect the model to return a single JSON object
-            data = json.loads(raw)
-            return Plan.model_validate(data)
+            # Expect the model to return a single JSON object; parsed and validated in one pass
+            return Plan.model_validate_json(raw)
         except Exception:
             return None
 
@@ -175,8 +173,8 @@ def handle_assistant_query(
         return resp
 
     p = safe_join(vault_root, note_path)
-    text = p.read_text(encoding="utf-8", errors="ignore")
-    fm, body = parse_frontmatter(text)
+    # Shares /note's mtime-keyed parse cache; a missing file still raises FileNotFoundError
+    text, fm, body = read_note(p)
     resp["frontmatter"] = fm
 
     section2 = section
@@ -184,13 +182,13 @@ def handle_assistant_query(
         section2 = plan.section_hint
 
     if section2:
-        sec = extract_section(body, section2)
+        sec = extract_section_cached(body, section2)
         resp["text"] = sec if sec is not None else ""
         resp["section"] = section2
         return resp
 
     if intent == Intent.TABLE:
-        resp["tables"] = extract_tables(text)
+        resp["tables"] = list(extract_tables_cached(text))
         resp["count"] = len(resp["tables"])
         return resp
 
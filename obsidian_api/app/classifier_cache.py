@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from .cache import LRUCache
+from .intent import IntentResult
+
+try:
+    # Optional: only used when the semantic cache stage is enabled
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # pragma: no cover
+    np = None
+    SentenceTransformer = None
+
+
+@dataclass
+class CachedClassificationMetrics:
+    """Metrics for a classification answered from the cache."""
+    request_time: float
+    response_time: float
+    total_latency_ms: float
+    success: bool = True
+    model_used: str = "cache"
+    error_message: Optional[str] = None
+
+
+def normalize_query(text: str) -> str:
+    """Cache key for a query: lowercase with whitespace collapsed."""
+    return " ".join((text or "").lower().split())
+
+
+class _SemanticIndex:
+    """Tiny in-memory embedding index with cosine top-1 lookup."""
+
+    def __init__(self, model_name: str, threshold: float, max_entries: int):
+        self.model = SentenceTransformer(model_name)
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._vectors = []
+        self._results: list[IntentResult] = []
+        self._lock = threading.Lock()
+
+    def _embed(self, text: str):
+        return self.model.encode(text, normalize_embeddings=True)
+
+    def lookup(self, text: str) -> Optional[IntentResult]:
+        vector = self._embed(text)
+        with self._lock:
+            if not self._vectors:
+                return None
+            scores = np.stack(self._vectors) @ vector
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            return self._results[best]
+
+    def add(self, text: str, result: IntentResult) -> None:
+        vector = self._embed(text)
+        with self._lock:
+            self._vectors.append(vector)
+            self._results.append(result)
+            if len(self._vectors) > self.max_entries:
+                del self._vectors[0]
+                del self._results[0]
+
+
+class CachedClassifier:
+    """Classifier wrapper that reuses recent classifications.
+
+    Stage 1 is an exact-match cache on the normalized query with a TTL.
+    Stage 2 (opt-in via ENABLE_SEMANTIC_CLASSIFIER_CACHE=1, needs sentence-transformers)
+    accepts the cached intent of a sufficiently similar earlier query.
+    """
+
+    def __init__(self, classifier, ttl_seconds: float = 600.0, maxsize: int = 1024):
+        self.classifier = classifier
+        self.ttl_seconds = ttl_seconds
+        self._exact = LRUCache(maxsize=maxsize)
+        self._semantic = self._create_semantic_index()
+
+    def _create_semantic_index(self) -> Optional[_SemanticIndex]:
+        if os.environ.get("ENABLE_SEMANTIC_CLASSIFIER_CACHE", "").strip() != "1":
+            return None
+        if SentenceTransformer is None:
+            return None
+        try:
+            return _SemanticIndex(
+                model_name=os.environ.get("SEMANTIC_CACHE_MODEL", "all-MiniLM-L6-v2"),
+                threshold=float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0.92")),
+                max_entries=int(os.environ.get("SEMANTIC_CACHE_SIZE", "512")),
+            )
+        except Exception:
+            return None
+
+    def classify(self, text: str):
+        start_time = time.time()
+        key = normalize_query(text)
+
+        entry = self._exact.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            _, cached_text, cached_result, model_used = entry
+            result = cached_result
+            if text != cached_text:
+                # Keep the cached intent/confidence but the caller's own query text
+                result = replace(cached_result, entities={**cached_result.entities, "query": text})
+            return result, self._hit_metrics(start_time, f"cache:{model_used}")
+
+        if self._semantic is not None:
+            try:
+                cached_result = self._semantic.lookup(key)
+            except Exception:
+                cached_result = None
+            if cached_result is not None:
+                # Note/section entities belonged to the earlier query, so drop them
+                entities = {**cached_result.entities, "query": text, "note": None, "section": None}
+                return replace(cached_result, entities=entities), self._hit_metrics(start_time, "semantic-cache")
+
+        result, metrics = self.classifier.classify(text)
+
+        # Only remember clean classifications, never LLM failures or fallbacks
+        if metrics.success and not metrics.error_message:
+            self._exact.put(key, (time.monotonic() + self.ttl_seconds, text, result, metrics.model_used))
+            if self._semantic is not None:
+                try:
+                    self._semantic.add(key, result)
+                except Exception:
+                    pass
+
+        return result, metrics
+
+    def _hit_metrics(self, start_time: float, model_used: str) -> CachedClassificationMetrics:
+        end_time = time.time()
+        return CachedClassificationMetrics(
+            request_time=start_time,
+            response_time=end_time,
+            total_latency_ms=(end_time - start_time) * 1000,
+            model_used=model_used,
+        )
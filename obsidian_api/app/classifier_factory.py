@@ -7,7 +7,7 @@ from enum import Enum
 from typing import Protocol, Optional
 
 from .intent import IntentResult, IntentClassifier
-from .llm_classifier import LLMIntentClassifier, LLMClassificationMetrics
+from .llm_classifier import BatchingLLMClassifier, LLMIntentClassifier, LLMClassificationMetrics
 
 
 class ClassifierType(str, Enum):
@@ -46,7 +46,8 @@ class UnifiedIntentClassifier:
     def __init__(self, 
                  classifier_type: ClassifierType = ClassifierType.AUTO,
                  llm_model: str = "gpt-4o-mini",
-                 fallback_enabled: bool = True):
+                 fallback_enabled: bool = True,
+                 batch_window_ms: float = 0.0):
         self.classifier_type = classifier_type
         self.llm_model = llm_model
         self.fallback_enabled = fallback_enabled
@@ -54,6 +55,11 @@ class UnifiedIntentClassifier:
         # Initialize classifiers
         self.rule_classifier = IntentClassifier()
         self.llm_classifier = LLMIntentClassifier(model=llm_model)
+        if batch_window_ms > 0:
+            # Concurrent LLM classifications share one provider call
+            self.llm_classifier = BatchingLLMClassifier(
+                self.llm_classifier, window_seconds=batch_window_ms / 1000
+            )
         
     def classify(self, text: str) -> tuple[IntentResult, ClassificationMetrics]:
         """Classify using the configured strategy."""
@@ -174,8 +180,15 @@ def create_classifier(classifier_type: Optional[str] = None) -> UnifiedIntentCla
     # Check if fallback is enabled
     fallback_enabled = os.environ.get("ENABLE_CLASSIFIER_FALLBACK", "1").strip() == "1"
     
+    # Micro-batching window for concurrent LLM classifications (0 disables batching)
+    try:
+        batch_window_ms = float(os.environ.get("LLM_CLASSIFIER_BATCH_WINDOW_MS", "0"))
+    except ValueError:
+        batch_window_ms = 0.0
+    
     return UnifiedIntentClassifier(
         classifier_type=classifier_enum,
         llm_model=llm_model,
-        fallback_enabled=fallback_enabled
+        fallback_enabled=fallback_enabled,
+        batch_window_ms=batch_window_ms
     )
\ No newline at end of file
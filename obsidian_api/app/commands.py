@@ -4,6 +4,7 @@ from .models import Command
 
 try:
     import yaml
+    _YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 except ImportError:
     yaml = None
 
@@ -28,7 +29,7 @@ def load_commands(commands_file: Path) -> List[Command]:
         return []  # Return empty if yaml not available
     if not commands_file.exists():
         return []
-    data = yaml.safe_load(commands_file.read_text(encoding="utf-8"))
+    data = yaml.load(commands_file.read_text(encoding="utf-8"), Loader=_YAML_LOADER)
     if not data:
         return []
     commands = []
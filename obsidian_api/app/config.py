@@ -23,6 +23,14 @@ class Settings(BaseModel):
     mobile_optimized: bool = os.getenv("MOBILE_OPTIMIZED", "true").lower() == "true"
     html_font_size: str = os.getenv("HTML_FONT_SIZE", "16px")
     html_max_width: str = os.getenv("HTML_MAX_WIDTH", "800px")
+    minify_assets: bool = os.getenv("MINIFY_ASSETS", "true").lower() == "true"  # false keeps readable CSS/JS
+    # inline = <style>/<script> in every page; external = hashed /static/ files the client caches
+    html_assets: str = os.getenv("HTML_ASSETS", "inline").lower()
+    html_asset_base_url: str = os.getenv("HTML_ASSET_BASE_URL", "").rstrip("/")  # e.g. http://host:8787 when pages load from elsewhere
+    markdown_backend: str = os.getenv("MARKDOWN_BACKEND", "python").lower()  # python|cmark (needs cmarkgfm)|mistune (needs mistune)
+    
+    # Compress responses over 500 bytes (brotli if brotli-asgi is installed, else gzip)
+    compress_responses: bool = os.getenv("COMPRESS_RESPONSES", "true").lower() == "true"
     
     # Markdown save settings
     vault_write_root: str = os.getenv("VAULT_WRITE_ROOT", "Inbox")  # Restrict saves to subdirectory for safety
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_ALLOW_ANY_ORIGIN = (b"access-control-allow-origin", b"*")
+
+
+class WildcardCORSMiddleware:
+    """CORS for allow_origins=["*"] without credentials.
+
+    Plain cross-origin requests only need a constant `Access-Control-Allow-Origin: *`
+    header, which is set without parsing the request headers into a dict.
+    Preflights and cookie-bearing requests are rare and go through Starlette's
+    CORSMiddleware so their responses stay identical.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.cors = CORSMiddleware(
+            app,
+            allow_origins=["*"],
+            allow_credentials=False,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        has_origin = False
+        for name, _ in scope["headers"]:
+            if name == b"origin":
+                has_origin = True
+            elif name == b"cookie" or name == b"access-control-request-method":
+                await self.cors(scope, receive, send)
+                return
+
+        if not has_origin:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Replace, not add: a second allow-origin header makes browsers reject the response
+                headers = [h for h in message.get("headers", ()) if h[0].lower() != _ALLOW_ANY_ORIGIN[0]]
+                headers.append(_ALLOW_ANY_ORIGIN)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
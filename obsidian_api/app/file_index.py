@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from pathlib import Path
+
+import orjson
+
+from .vault import list_md_files
+
+try:
+    # Optional: OS file notifications (inotify / FSEvents / ReadDirectoryChangesW)
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+
+class VaultFileIndex(FileSystemEventHandler):
+    """In-memory list of a vault's .md files, kept current by filesystem events.
+
+    One full walk at start(); afterwards create/delete/move events adjust the
+    index in place, so listings never touch the disk. `generation` counts every
+    .md change (edits included) for caches that depend on note contents.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        # Events report paths under the directory exactly as it was scheduled
+        self._prefix = str(root).replace("\\", "/").rstrip("/") + "/"
+        self._lock = threading.Lock()
+        self._paths: dict[str, None] = {}  # insertion-ordered set
+        self._snapshot: tuple[list[str], str] | None = None
+        self._observer = None
+        self.generation = 0
+
+    def start(self) -> None:
+        self._observer = Observer()
+        self._observer.schedule(self, str(self.root), recursive=True)
+        self._observer.start()
+        # Walk after the watch is live so nothing created in between is missed
+        paths = dict.fromkeys(list_md_files(self.root))
+        with self._lock:
+            self._paths = paths
+            self._snapshot = None
+
+    def stop(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+
+    def snapshot(self) -> tuple[list[str], str]:
+        """(files, version hash); the list is shared and must not be mutated"""
+        with self._lock:
+            if self._snapshot is None:
+                files = list(self._paths)
+                version = hashlib.blake2b(orjson.dumps(files), digest_size=16).hexdigest()
+                self._snapshot = (files, version)
+            return self._snapshot
+
+    def _rel(self, path: str | bytes) -> str | None:
+        if isinstance(path, bytes):
+            path = path.decode("utf-8", "surrogateescape")
+        path = path.replace("\\", "/")
+        if not path.startswith(self._prefix):
+            return None
+        return path[len(self._prefix):]
+
+    def _add(self, path: str | bytes, is_directory: bool) -> None:
+        if is_directory:
+            # A folder moved in arrives as one event; index whatever it holds
+            rel = self._rel(path)
+            if rel is None:
+                return
+            found = [f"{rel}/{p}" for p in list_md_files(self.root / rel)]
+            with self._lock:
+                self._paths.update(dict.fromkeys(found))
+                self._snapshot = None
+            return
+        rel = self._rel(path)
+        if rel is not None and rel.endswith(".md"):
+            with self._lock:
+                if rel not in self._paths:
+                    self._paths[rel] = None
+                    self._snapshot = None
+
+    def _remove(self, path: str | bytes, is_directory: bool) -> None:
+        rel = self._rel(path)
+        if rel is None:
+            return
+        with self._lock:
+            if is_directory:
+                prefix = rel + "/"
+                gone = [p for p in self._paths if p.startswith(prefix)]
+            else:
+                gone = [rel] if rel in self._paths else []
+            for p in gone:
+                del self._paths[p]
+            if gone:
+                self._snapshot = None
+
+    def on_any_event(self, event) -> None:
+        # Directory events on their own (e.g. an mtime bump when a child changes) change no note
+        if event.is_directory and event.event_type not in ("created", "deleted", "moved"):
+            return
+        self.generation += 1
+
+    def on_created(self, event) -> None:
+        self._add(event.src_path, event.is_directory)
+
+    def on_deleted(self, event) -> None:
+        self._remove(event.src_path, event.is_directory)
+
+    def on_moved(self, event) -> None:
+        self._remove(event.src_path, event.is_directory)
+        self._add(event.dest_path, event.is_directory)
+
+
+# Set by the app's lifespan when watchdog is installed; None means "walk the disk"
+_ACTIVE_INDEX: VaultFileIndex | None = None
+
+
+def start_file_index(root: Path) -> VaultFileIndex | None:
+    global _ACTIVE_INDEX
+    if Observer is None:
+        return None
+    index = VaultFileIndex(root)
+    index.start()
+    _ACTIVE_INDEX = index
+    return index
+
+
+def stop_file_index() -> None:
+    global _ACTIVE_INDEX
+    if _ACTIVE_INDEX is not None:
+        _ACTIVE_INDEX.stop()
+        _ACTIVE_INDEX = None
+
+
+def indexed_md_files(root: Path) -> tuple[list[str], str] | None:
+    """The live index for `root`, or None when no watcher covers it"""
+    index = _ACTIVE_INDEX
+    if index is None or index.root != root:
+        return None
+    return index.snapshot()
+
+
+def vault_generation(root: Path) -> int | None:
+    """Change counter of the live index for `root`, or None when no watcher covers it"""
+    index = _ACTIVE_INDEX
+    if index is None or index.root != root:
+        return None
+    return index.generation
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import json
 import os
+import threading
 import time
+from concurrent.futures import Future
 from dataclasses import dataclass
 from typing import Optional
 
@@ -28,6 +29,11 @@ class LLMIntentRequest(BaseModel):
     reasoning: str = Field(..., description="Brief explanation for the classification")
 
 
+class LLMIntentBatchResponse(BaseModel):
+    """Schema for a batched LLM intent classification response."""
+    results: list[LLMIntentRequest] = Field(..., description="One classification per query, in input order")
+
+
 @dataclass(frozen=True)
 class LLMClassificationMetrics:
     """Metrics for LLM classification performance."""
@@ -130,6 +136,54 @@ class LLMIntentClassifier:
             
             return result, metrics
     
+    def classify_batch(self, texts: list[str]) -> list[tuple[IntentResult, LLMClassificationMetrics]]:
+        """Classify several queries with a single LLM call.
+
+        Raises on any provider or parsing problem so the caller can fall back to classify().
+        """
+        if not self._is_enabled():
+            raise RuntimeError("LLM classification is not enabled")
+
+        start_time = time.time()
+        client = OpenAI(
+            api_key=os.environ["OPENAI_API_KEY"],
+            timeout=self.timeout
+        )
+
+        response = client.beta.chat.completions.parse(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": self._build_system_prompt()},
+                {"role": "user", "content": self._build_batch_prompt(texts)}
+            ],
+            response_format=LLMIntentBatchResponse,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens * len(texts)
+        )
+
+        response_time = time.time()
+
+        parsed = response.choices[0].parsed
+        if not parsed or len(parsed.results) != len(texts):
+            raise ValueError("Failed to parse batched LLM response")
+
+        token_usage = response.usage.model_dump() if response.usage else None
+        if token_usage is not None:
+            token_usage["batch_size"] = len(texts)
+
+        metrics = LLMClassificationMetrics(
+            request_time=start_time,
+            response_time=response_time,
+            total_latency_ms=(response_time - start_time) * 1000,
+            token_usage=token_usage,
+            model_used=self.model,
+            success=True
+        )
+        return [
+            (self._convert_to_intent_result(llm_result, text), metrics)
+            for llm_result, text in zip(parsed.results, texts)
+        ]
+
     def _is_enabled(self) -> bool:
         """Check if LLM classification is enabled."""
         return (
@@ -170,6 +224,11 @@ Focus on user's actual intent, ignoring grammatical variations or spacing issues
         """Build user prompt with the input text."""
         return f"Classify this user query: \"{text}\""
     
+    def _build_batch_prompt(self, texts: list[str]) -> str:
+        """Build user prompt listing several queries to classify in order."""
+        lines = "\n".join(f"{i}. \"{text}\"" for i, text in enumerate(texts, 1))
+        return f"Classify each of these user queries. Return exactly one result per query, in the same order:\n{lines}"
+
     def _convert_to_intent_result(self, llm_result: LLMIntentRequest, original_text: str) -> IntentResult:
         """Convert LLM result to IntentResult."""
         try:
@@ -185,4 +244,68 @@ Focus on user's actual intent, ignoring grammatical variations or spacing issues
             intent=intent,
             confidence=llm_result.confidence,
             entities=entities
-        )
\ No newline at end of file
+        )
+
+
+class BatchingLLMClassifier:
+    """Micro-batches concurrent classify() calls into one LLM request.
+
+    One caller at a time is the leader: it waits up to `window_seconds` (or until
+    `max_batch` queries are pending), classifies the oldest pending queries in one
+    call, and stops as soon as its own query is answered. A waiting caller whose
+    query is still pending then takes over, so no caller drains on behalf of
+    later arrivals indefinitely. A failed batch is retried per query.
+    """
+
+    def __init__(self, classifier: LLMIntentClassifier, max_batch: int = 8, window_seconds: float = 0.02):
+        self.classifier = classifier
+        self.max_batch = max_batch
+        self.window_seconds = window_seconds
+        self._pending: list[tuple[str, Future]] = []
+        self._draining = False
+        self._cond = threading.Condition()
+
+    def classify(self, text: str) -> tuple[IntentResult, LLMClassificationMetrics]:
+        future: Future = Future()
+        with self._cond:
+            self._pending.append((text, future))
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+            # Woken when a batch completes or the leader steps down
+            while self._draining and not future.done():
+                self._cond.wait()
+            leader = not future.done()
+            if leader:
+                self._draining = True
+        if leader:
+            self._drain(future)
+        return future.result()
+
+    def _drain(self, own: Future) -> None:
+        try:
+            while not own.done():
+                with self._cond:
+                    self._cond.wait_for(lambda: len(self._pending) >= self.max_batch, timeout=self.window_seconds)
+                    batch = self._pending[:self.max_batch]
+                    del self._pending[:self.max_batch]
+                self._run_batch(batch)
+                with self._cond:
+                    self._cond.notify_all()
+        finally:
+            with self._cond:
+                self._draining = False
+                self._cond.notify_all()
+
+    def _run_batch(self, batch: list[tuple[str, Future]]) -> None:
+        texts = [text for text, _ in batch]
+        results = None
+        if len(batch) > 1:
+            try:
+                results = self.classifier.classify_batch(texts)
+            except Exception:
+                results = None
+        for index, (text, future) in enumerate(batch):
+            try:
+                future.set_result(results[index] if results is not None else self.classifier.classify(text))
+            except Exception as e:
+                future.set_exception(e)
@@ -1,10 +1,31 @@
+import atexit
 import logging
+import queue
 import time
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+import orjson
+
+# Records waiting for the background writer; beyond this they are dropped, never blocking a request
+LOG_QUEUE_SIZE = 10000
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that discards records when the queue is full."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
 
 def setup_orchestrator_logger(name: str = "orchestrator", level: str = "DEBUG") -> logging.Logger:
-    """Setup standardized logger for orchestrator operations with UTF-8 support."""
+    """Setup standardized logger for orchestrator operations with UTF-8 support.
+
+    Records are handed to a background listener thread, so stream writes stay off the request path.
+    """
     logger = logging.getLogger(name)
     
     if not logger.handlers:  # Avoid duplicate handlers
@@ -17,7 +38,12 @@ def setup_orchestrator_logger(name: str = "orchestrator", level: str = "DEBUG")
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        listener = QueueListener(log_queue, handler)
+        listener.start()
+        atexit.register(listener.stop)  # flush whatever is still queued on shutdown
+        logger.addHandler(_DroppingQueueHandler(log_queue))
     
     logger.setLevel(getattr(logging, level.upper()))
     return logger
@@ -81,14 +107,15 @@ def log_execution(logger: logging.Logger,
     if error:
         log_data["error"] = error
     
-    # Format log message with Japanese support
+    # Format log message with Japanese support (orjson keeps non-ASCII as-is)
     status_icon = "✅" if success else "❌"
     action_desc = action.replace("_", " ").title()
+    payload = orjson.dumps(log_data, default=str).decode()
     
     if error:
-        logger.error(f"{status_icon} {action_desc}: {log_data}")
+        logger.error(f"{status_icon} {action_desc}: {payload}")
     else:
-        logger.info(f"{status_icon} {action_desc}: {log_data}")
+        logger.info(f"{status_icon} {action_desc}: {payload}")
 
 
 def _sanitize_response_data(response_data: dict) -> dict:
@@ -1,45 +1,129 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import os
+import threading
+import time
+import uuid
+from html import escape as escape_html
 from pathlib import Path
 from urllib.parse import quote
 from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator
 
-from fastapi import FastAPI, Depends, HTTPException, Query, Response
+import orjson
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
+try:
+    # Optional: Brotli compresses HTML/CSS noticeably better than gzip at similar CPU cost
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
+
+from .cache import LRUCache
 from .config import settings
+from .cors import WildcardCORSMiddleware
 from .security import require_api_key
-from .vault import safe_join, parse_frontmatter, extract_section, list_md_files
-from .search import grep_vault
-from .resolver import resolve_query
+from .vault import (
+    safe_join, read_note, invalidate_note, clear_note_cache, extract_section_cached, list_md_files, note_name, vault_signature
+)
+from .search import grep_vault, invalidate_search_text, clear_search_cache
+from .file_index import start_file_index, stop_file_index, indexed_md_files
+from .resolver import resolve_query, clear_resolve_cache
 from .assistant_logic import handle_assistant_query
 from .intent import IntentClassifier, Intent, IntentResult
 from .routing import RoutingPolicy, Action, ClarificationGenerator
 from .classifier_factory import create_classifier, ClassifierType
+from .classifier_cache import CachedClassifier
 from .logging_utils import setup_orchestrator_logger, log_execution, create_session_id
-from .presentation.html_renderer import HtmlRenderer
+from .presentation.html_renderer import HtmlRenderer, clear_fragment_cache, get_static_asset
 from .presentation.presenters import create_presenter
 
 
-app = FastAPI(title="AIsecretary Obsidian Vault API", version="0.3.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Checked once at boot instead of stat-ing the vault root on every request
+    if not VAULT_ROOT.is_dir():
+        raise RuntimeError(f"VAULT_ROOT not found: {VAULT_ROOT}")
+    
+    # One shared pool for blocking filesystem / LLM work offloaded by async endpoints
+    executor = ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 4, thread_name_prefix="vault-io")
+    asyncio.get_running_loop().set_default_executor(executor)
+    
+    # Single background writer for save_md requests sent with async_write=true
+    global _save_queue
+    _save_queue = asyncio.Queue()
+    writer = asyncio.create_task(_save_writer(_save_queue))
+    
+    # Watch the vault (when watchdog is installed) so listings come from memory
+    await asyncio.to_thread(start_file_index, VAULT_ROOT)
+    yield
+    await asyncio.to_thread(stop_file_index)
+    await _save_queue.join()  # flush pending saves before shutting down
+    writer.cancel()
+    _save_queue = None
+    executor.shutdown(wait=False)
+
+
+app = FastAPI(
+    title="AIsecretary Obsidian Vault API",
+    version="0.3.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 origins = (
     [o.strip() for o in settings.cors_origins.split(",")]
     if getattr(settings, "cors_origins", None)
     else ["*"]
 )
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins if origins != ["*"] else ["*"],
-    allow_credentials=False,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+if origins == ["*"]:
+    # Wildcard CORS headers are constant; skip the generic middleware's per-request work
+    app.add_middleware(WildcardCORSMiddleware)
+else:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=False,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+if settings.compress_responses:
+    # Brotli when installed (it still serves gzip to clients without br), else Starlette's gzip
+    if BrotliMiddleware is not None:
+        app.add_middleware(BrotliMiddleware, quality=4, minimum_size=500)
+    else:
+        app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=6)
 
 VAULT_ROOT = Path(settings.vault_root)
 COMMANDS_FILE = Path(__file__).parent.parent / "commands.yml"
 
+# Response action name per executed intent
+_INTENT_ACTION = {
+    Intent.OPEN: "open",
+    Intent.SEARCH: "search",
+    Intent.READ: "read",
+    Intent.SUMMARIZE: "summarize",
+    Intent.TABLE: "table",
+    Intent.COMMENT: "comment",
+    Intent.UPDATE: "update",
+}
+# Actions whose result Shortcuts should display instead of opening Obsidian
+_DISPLAY_ACTIONS = frozenset({"search", "read", "comment", "summarize"})
+# Runs fallback intents alongside the primary execution
+_FALLBACK_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fallback")
+
 
 @dataclass(frozen=True)
 class AssistantOrchestrator:
@@ -60,7 +144,7 @@ class AssistantOrchestrator:
     
     def __post_init__(self):
         # Create unified classifier and logger based on configuration
-        object.__setattr__(self, 'classifier', create_classifier())
+        object.__setattr__(self, 'classifier', CachedClassifier(create_classifier()))
         object.__setattr__(self, 'logger', setup_orchestrator_logger())
 
     def run(
@@ -75,8 +159,7 @@ class AssistantOrchestrator:
         """Main orchestration entry point with simple logging."""
         
         session_id = create_session_id()
-        import time
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
             # Step 1: Classify intent
@@ -89,7 +172,7 @@ class AssistantOrchestrator:
             if routing_decision.action == Action.CLARIFY:
                 clarification = self.clarification_generator.generate_clarification(intent_result)
                 
-                duration_ms = (time.time() - start_time) * 1000
+                duration_ms = (time.monotonic() - start_time) * 1000
                 log_execution(
                     self.logger, session_id, query, intent_result.intent.value,
                     intent_result.confidence, classification_metrics.model_used,
@@ -114,7 +197,20 @@ class AssistantOrchestrator:
                     "duration_ms": duration_ms
                 }
             
-            # Step 4: Execute the intent
+            # Step 4: Execute the intent, starting the fallback alongside it so a
+            # failed primary doesn't then wait for a second run
+            fallback_future = None
+            if routing_decision.fallback_intent:
+                fallback_future = _FALLBACK_POOL.submit(
+                    self._try_fallback,
+                    original_intent=intent_result.intent,
+                    fallback_intent=routing_decision.fallback_intent,
+                    query=query,
+                    vault_name=vault_name,
+                    prefer=prefer,
+                    heading=heading,
+                    section=section
+                )
             result = self._execute_intent(
                 intent_result=intent_result,
                 vault_name=vault_name,
@@ -125,9 +221,11 @@ class AssistantOrchestrator:
             
             # Check execution success
             if result.get("ok", False) or result.get("found", False):
+                if fallback_future is not None:
+                    fallback_future.cancel()
                 response = self._format_success_response(result, intent_result, routing_decision)
                 
-                duration_ms = (time.time() - start_time) * 1000
+                duration_ms = (time.monotonic() - start_time) * 1000
                 result_summary = self._create_result_summary(result, response)
                 log_execution(
                     self.logger, session_id, query, intent_result.intent.value,
@@ -144,20 +242,12 @@ class AssistantOrchestrator:
             
             # Try fallback if available
             if routing_decision.fallback_intent:
-                fallback_result = self._try_fallback(
-                    original_intent=intent_result.intent,
-                    fallback_intent=routing_decision.fallback_intent,
-                    query=query,
-                    vault_name=vault_name,
-                    prefer=prefer,
-                    heading=heading,
-                    section=section
-                )
+                fallback_result = fallback_future.result()
                 
                 if fallback_result and (fallback_result.get("ok", False) or fallback_result.get("found", False)):
                     response = self._format_fallback_response(fallback_result, intent_result, routing_decision)
                     
-                    duration_ms = (time.time() - start_time) * 1000
+                    duration_ms = (time.monotonic() - start_time) * 1000
                     result_summary = self._create_result_summary(fallback_result, response)
                     log_execution(
                         self.logger, session_id, query, intent_result.intent.value,
@@ -176,7 +266,7 @@ class AssistantOrchestrator:
             # Execution failed
             response = self._format_failure_response(result, intent_result, routing_decision)
             
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.monotonic() - start_time) * 1000
             log_execution(
                 self.logger, session_id, query, intent_result.intent.value,
                 intent_result.confidence, classification_metrics.model_used,
@@ -190,7 +280,7 @@ class AssistantOrchestrator:
             return response
             
         except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.monotonic() - start_time) * 1000
             
             log_execution(
                 self.logger, session_id, query, "unknown", 0.0, "unknown",
@@ -315,16 +405,7 @@ class AssistantOrchestrator:
     
     def _intent_to_action_name(self, intent: Intent) -> str:
         """Convert intent to action name for response."""
-        mapping = {
-            Intent.OPEN: "open",
-            Intent.SEARCH: "search", 
-            Intent.READ: "read",
-            Intent.SUMMARIZE: "summarize",
-            Intent.TABLE: "table",
-            Intent.COMMENT: "comment",
-            Intent.UPDATE: "update"
-        }
-        return mapping.get(intent, "unknown")
+        return _INTENT_ACTION.get(intent, "unknown")
     
     def _create_result_summary(self, result: dict, response: dict) -> str:
         """Create a short summary of execution results."""
@@ -359,7 +440,7 @@ def _add_shortcut_keys(data: dict) -> dict:
     if action == 'open' and obsidian_url:
         enhanced_data['shortcut_action'] = 'open_obsidian'
         enhanced_data['should_open_obsidian'] = True
-    elif action in ['search', 'read', 'comment', 'summarize']:
+    elif action in _DISPLAY_ACTIONS:
         enhanced_data['shortcut_action'] = 'display_content'
         enhanced_data['should_open_obsidian'] = False
     elif action == 'list_files':
@@ -378,21 +459,128 @@ def _add_shortcut_keys(data: dict) -> dict:
     return enhanced_data
 
 
+# /files listing as (vault root, mtime signature, monotonic expiry, files).
+# Directory mtimes only reflect direct children, so deeper changes are bounded by the TTL.
+_FILES_CACHE: tuple[Path, float, float, list[str], str] | None = None
+_FILES_CACHE_TTL = 30.0
+
+
+def _listing_version(files: list[str]) -> str:
+    return hashlib.blake2b(orjson.dumps(files), digest_size=16).hexdigest()
+
+
+def _cached_md_files(root: Path) -> tuple[list[str], str]:
+    """list_md_files() and a content hash of it, reused until the vault's folders change or the TTL lapses"""
+    global _FILES_CACHE
+    indexed = indexed_md_files(root)
+    if indexed is not None:
+        return indexed
+    
+    try:
+        signature = vault_signature(root)
+    except OSError:
+        files = list_md_files(root)
+        return files, _listing_version(files)
+    
+    now = time.monotonic()
+    cached = _FILES_CACHE
+    if cached and cached[0] == root and cached[1] == signature and now < cached[2]:
+        return cached[3], cached[4]
+    
+    files = list_md_files(root)
+    version = _listing_version(files)
+    _FILES_CACHE = (root, signature, now + _FILES_CACHE_TTL, files, version)
+    return files, version
+
+
+def _invalidate_files_cache() -> None:
+    global _FILES_CACHE
+    _FILES_CACHE = None
+
+
+# Rendered HTML bodies keyed on (content_type, title, data digest, theme, mobile)
+_HTML_RESPONSE_CACHE = LRUCache(maxsize=512)
+# Bigger documents (e.g. archived daily notes) are not kept, so the cache can't grow to GBs
+_HTML_CACHE_MAX_BYTES = 1 << 20
+# Responses sit behind the API key, so only the client itself may cache them
+_HTML_CACHE_CONTROL = "private, max-age=60"
+# Assistant answers carry a fresh session_id/duration_ms and reflect one orchestrator run:
+# never reusable, so neither kept server-side nor replayable by the client
+_ASSISTANT_CACHE_CONTROL = "no-store"
+
+
+@lru_cache(maxsize=32)
+def _get_renderer(theme: str | None, mobile: bool | None) -> HtmlRenderer:
+    """Shared HtmlRenderer per (theme, mobile) combination"""
+    return HtmlRenderer(theme=theme, mobile_optimized=mobile)
+
+
+def _data_digest(data: dict) -> str | None:
+    """Digest of a response payload for cache keys, or None if it can't be serialized"""
+    try:
+        raw = orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        return None
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
 def _format_response(
     data: dict, 
     format: str = "json",
     content_type: str = "assistant",
     title: str = "AIsecretary",
     css_theme: str | None = None,
-    mobile: bool | None = None
+    mobile: bool | None = None,
+    cache_key: tuple | None = None
 ):
-    """Format response based on requested format"""
+    """Format response based on requested format.
+
+    `cache_key` names the HTML rendering when the caller can identify it more cheaply
+    than by hashing `data` (e.g. a note's path and version).
+    """
     if format.lower() != "html":
         # Add shortcut helper keys for JSON responses
         if content_type == "assistant":
             data = _add_shortcut_keys(data)
         return data
     
+    if content_type == "assistant":
+        return _html_response(
+            _render_html_bytes(data, content_type, title, css_theme, mobile), _ASSISTANT_CACHE_CONTROL
+        )
+    
+    if cache_key is None:
+        digest = _data_digest(data)
+        if digest is not None:
+            cache_key = (content_type, title, digest, css_theme, mobile)
+    if cache_key is not None:
+        html_content = _HTML_RESPONSE_CACHE.get(cache_key)
+        if html_content is not None:
+            return _html_response(html_content)
+    
+    html_content = _render_html_bytes(data, content_type, title, css_theme, mobile)
+    if cache_key is not None and len(html_content) <= _HTML_CACHE_MAX_BYTES:
+        _HTML_RESPONSE_CACHE.put(cache_key, html_content)
+    return _html_response(html_content)
+
+
+def _html_response(html_content: bytes, cache_control: str = _HTML_CACHE_CONTROL) -> Response:
+    # Fresh Response per request; only the body bytes are shared between requests
+    return Response(
+        content=html_content,
+        media_type="text/html; charset=utf-8",
+        headers={"Cache-Control": cache_control}
+    )
+
+
+def _render_html_bytes(
+    data: dict,
+    content_type: str,
+    title: str,
+    css_theme: str | None,
+    mobile: bool | None
+) -> bytes:
+    """Convert response data to Markdown via its presenter and render it as HTML"""
     # Create presenter and convert to markdown
     presenter = create_presenter(content_type)
     
@@ -414,8 +602,8 @@ def _format_response(
         markdown = presenter.to_markdown(data)
     else:
         # Fallback: convert dict to simple markdown
-        import json
-        markdown = f"# {title}\n\n```json\n{json.dumps(data, indent=2, ensure_ascii=False)}\n```"
+        dumped = orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        markdown = f"# {title}\n\n```json\n{dumped}\n```"
     
     # Add shortcut keys for HTML format too
     if content_type == "assistant":
@@ -429,73 +617,137 @@ def _format_response(
     else:
         shortcut_metadata = {"shortcut_action": "display_content", "should_open_obsidian": False}
     
-    # Create HTML renderer with dynamic settings
-    renderer = HtmlRenderer(
-        theme=css_theme,
-        mobile_optimized=mobile
-    )
-    
-    html_content = renderer.render(markdown, title, shortcut_metadata)
-    
-    return Response(content=html_content, media_type="text/html; charset=utf-8")
+    renderer = _get_renderer(css_theme, mobile)
+    return renderer.render_bytes(markdown, title, shortcut_metadata)
 
 
-@app.get("/health")
-def health(response: Response):
-    response.headers["Cache-Control"] = "no-store"
-    return {
-        "status": "ok",
-        "service": "obsidian-api",
-        "version": "0.3.0",
-        "time": datetime.now().astimezone().isoformat()
-    }
+def _json_response(data) -> Response:
+    """Encode with orjson directly, skipping FastAPI's jsonable_encoder pass"""
+    try:
+        return ORJSONResponse(data)
+    except TypeError:
+        # Non-native values (Path, set, ...): let FastAPI coerce them as before
+        return ORJSONResponse(jsonable_encoder(data))
 
-@app.get("/obsidian-api/health")
-def obsidian_api_health(response: Response):
-    response.headers["Cache-Control"] = "no-store"
-    return {
-        "status": "ok",
-        "service": "obsidian-api",
-        "version": "0.3.0",
-        "time": datetime.now().astimezone().isoformat()
-    }
+
+async def _format_response_async(data: dict, format: str = "json", **kwargs):
+    """_format_response with HTML rendering moved off the event loop"""
+    if format.lower() != "html":
+        return _json_response(_format_response(data, format, **kwargs))
+    return await asyncio.to_thread(_format_response, data, format, **kwargs)
+
+
+def _variant_etag(*parts) -> str:
+    """Quoted ETag over a resource version plus the query options that shape the body"""
+    raw = "\x1f".join(map(str, parts)).encode("utf-8")
+    return '"' + hashlib.blake2b(raw, digest_size=12).hexdigest() + '"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """True when the client's If-None-Match already names this ETag (weak comparison)"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def _with_content_etag(request: Request, response: Response) -> Response:
+    """Tag a built response with a hash of its body; 304 when the client already has it.
+
+    For results that are recomputed anyway (search, resolve): the work isn't saved,
+    only the transfer.
+    """
+    etag = '"' + hashlib.blake2b(response.body, digest_size=12).hexdigest() + '"'
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return response
+
+
+def _note_not_modified(request: Request, etag: str, st: os.stat_result) -> bool:
+    """Conditional GET for a note: If-None-Match wins; If-Modified-Since only applies without it"""
+    if "if-none-match" in request.headers:
+        return _etag_matches(request, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(st.st_mtime) <= since
+
+
+def _note_validators(etag: str, st: os.stat_result) -> dict[str, str]:
+    return {"ETag": etag, "Last-Modified": formatdate(st.st_mtime, usegmt=True)}
+
+
+# Pre-serialized health payload as (epoch second, body); rebuilt at most once per second
+_health_cache: tuple[int, bytes] | None = None
+
+
+def _health_response() -> Response:
+    global _health_cache
+    now = int(time.time())
+    cached = _health_cache
+    if cached is None or cached[0] != now:
+        body = orjson.dumps({
+            "status": "ok",
+            "service": "obsidian-api",
+            "version": "0.3.0",
+            "time": datetime.now().astimezone().isoformat()
+        })
+        cached = _health_cache = (now, body)
+    return Response(content=cached[1], media_type="application/json", headers={"Cache-Control": "no-store"})
+
+
+@app.get("/health", response_class=Response)
+async def health():
+    return _health_response()
+
+@app.get("/obsidian-api/health", response_class=Response)
+async def obsidian_api_health():
+    return _health_response()
 
 
 @app.get("/files", dependencies=[Depends(require_api_key)])
-def files(
+async def files(
+    request: Request,
     format: str = Query(default="json", description="Response format: json|html"),
     css_theme: str | None = Query(default=None, description="CSS theme for HTML: obsidian|light|dark|minimal"),
     mobile: bool | None = Query(default=None, description="Mobile optimization for HTML")
 ):
-    if not VAULT_ROOT.exists():
-        raise HTTPException(500, detail="VAULT_ROOT not found")
-    
-    result = {"files": list_md_files(VAULT_ROOT)}
+    md_files, version = await asyncio.to_thread(_cached_md_files, VAULT_ROOT)
+    etag = _variant_etag(version, format.lower(), css_theme, mobile)
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
     
-    return _format_response(
-        data=result,
+    response = await _format_response_async(
+        data={"files": md_files},
         format=format,
         content_type="files",
         title="ファイル一覧",
         css_theme=css_theme,
         mobile=mobile
     )
+    response.headers["ETag"] = etag
+    return response
 
 
 @app.get("/search", dependencies=[Depends(require_api_key)])
-def search(
+async def search(
+    request: Request,
     q: str = Query(..., min_length=1), 
     limit: int = 30,
     format: str = Query(default="json", description="Response format: json|html"),
     css_theme: str | None = Query(default=None, description="CSS theme for HTML: obsidian|light|dark|minimal"),
     mobile: bool | None = Query(default=None, description="Mobile optimization for HTML")
 ):
-    if not VAULT_ROOT.exists():
-        raise HTTPException(500, detail="VAULT_ROOT not found")
-    
-    result = {"q": q, "hits": grep_vault(VAULT_ROOT, q, limit=limit)}
+    result = {"q": q, "hits": await asyncio.to_thread(grep_vault, VAULT_ROOT, q, limit=limit)}
     
-    return _format_response(
+    response = await _format_response_async(
         data=result,
         format=format,
         content_type="search",
@@ -503,10 +755,12 @@ def search(
         css_theme=css_theme,
         mobile=mobile
     )
+    return _with_content_etag(request, response)
 
 
 @app.get("/note", dependencies=[Depends(require_api_key)])
-def note(
+async def note(
+    request: Request,
     path: str = Query(..., description="Vault-relative path like Foo/Bar.md"),
     section: str | None = Query(default=None, description="Heading title to extract, exact match"),
     with_frontmatter: bool = True,
@@ -514,21 +768,36 @@ def note(
     css_theme: str | None = Query(default=None, description="CSS theme for HTML: obsidian|light|dark|minimal"),
     mobile: bool | None = Query(default=None, description="Mobile optimization for HTML")
 ):
-    if not VAULT_ROOT.exists():
-        raise HTTPException(500, detail="VAULT_ROOT not found")
     try:
         p = safe_join(VAULT_ROOT, path)
     except ValueError as e:
         raise HTTPException(400, detail=str(e))
-    if not p.exists():
+    try:
+        st = await asyncio.to_thread(p.stat)
+    except FileNotFoundError:
         raise HTTPException(404, detail="Note not found")
 
-    text = p.read_text(encoding="utf-8", errors="ignore")
-    fm, body = parse_frontmatter(text)
+    # The note's mtime/size identify its version; the query options pick the representation
+    etag = _variant_etag(st.st_mtime_ns, st.st_size, section, with_frontmatter, format.lower(), css_theme, mobile)
+    validators = _note_validators(etag, st)
+    if _note_not_modified(request, etag, st):
+        return Response(status_code=304, headers=validators)
+
+    # A rendered page for this exact note version and options skips the read and render
+    html_key = None
+    if format.lower() == "html":
+        html_key = ("note", path, etag)
+        html_content = _HTML_RESPONSE_CACHE.get(html_key)
+        if html_content is not None:
+            response = _html_response(html_content)
+            response.headers.update(validators)
+            return response
+
+    text, fm, body = await asyncio.to_thread(read_note, p, st)
     out_text = text
 
     if section:
-        sec = extract_section(body, section)
+        sec = extract_section_cached(body, section)
         if sec is None:
             raise HTTPException(404, detail=f"Section not found: {section}")
         out_text = sec
@@ -538,34 +807,41 @@ def note(
         resp["frontmatter"] = fm
     
     # Create title for HTML display
-    filename = path.split('/')[-1] if '/' in path else path
-    filename = filename.replace('.md', '')
-    title = f"ノート: {filename}"
+    title = f"ノート: {note_name(path)}"
     if section:
         title += f" - {section}"
     
-    return _format_response(
+    response = await _format_response_async(
         data=resp,
         format=format,
         content_type="note",
         title=title,
         css_theme=css_theme,
-        mobile=mobile
+        mobile=mobile,
+        cache_key=html_key
     )
+    response.headers.update(validators)
+    if html_key is None:
+        # JSON is cheap to revalidate, so make clients always ask
+        response.headers["Cache-Control"] = "private, max-age=0, must-revalidate"
+    return response
 
 
 @app.get("/resolve", dependencies=[Depends(require_api_key)])
-def resolve_open_target(
+async def resolve_open_target(
+    request: Request,
     q: str = Query(..., min_length=1),
     prefer: str = Query(default="most_hits"),
     format: str = Query(default="json", description="Response format: json|html"),
     css_theme: str | None = Query(default=None, description="CSS theme for HTML: obsidian|light|dark|minimal"),
     mobile: bool | None = Query(default=None, description="Mobile optimization for HTML")
 ):
-    r = resolve_query(query=q, vault_root=VAULT_ROOT, commands_file=COMMANDS_FILE, prefer=prefer)
+    r = await asyncio.to_thread(
+        resolve_query, query=q, vault_root=VAULT_ROOT, commands_file=COMMANDS_FILE, prefer=prefer
+    )
     result = r.model_dump()
     
-    return _format_response(
+    response = await _format_response_async(
         data=result,
         format=format,
         content_type="resolve",
@@ -573,6 +849,18 @@ def resolve_open_target(
         css_theme=css_theme,
         mobile=mobile
     )
+    return _with_content_etag(request, response)
+
+
+@lru_cache(maxsize=32)
+def _open_url_prefix(vault_name: str) -> str:
+    """`obsidian://open?vault=...&file=` for a vault; one vault per deployment in practice"""
+    return "obsidian://open?vault=" + quote(vault_name, safe="") + "&file="
+
+
+@lru_cache(maxsize=4096)
+def _encode_path(path: str) -> str:
+    return quote(path, safe="/")
 
 
 def obsidian_open_urls(vault_name: str, open_path: str, heading: str | None = None) -> dict[str, str]:
@@ -588,21 +876,17 @@ def obsidian_open_urls(vault_name: str, open_path: str, heading: str | None = No
     norm = open_path.replace("\\", "/")
 
     # Build both variants
-    without_md = norm[:-3] if norm.lower().endswith(".md") else norm
-    with_md = norm if norm.lower().endswith(".md") else norm + ".md"
-
-    vault_enc = quote(vault_name, safe="")
+    if norm.lower().endswith(".md"):
+        without_md, with_md = norm[:-3], norm
+    else:
+        without_md, with_md = norm, norm + ".md"
 
-    def _build(file_value: str) -> str:
-        file_enc = quote(file_value, safe="/")
-        url = f"obsidian://open?vault={vault_enc}&file={file_enc}"
-        if heading:
-            url += "%23" + quote(heading, safe="")
-        return url
+    prefix = _open_url_prefix(vault_name)
+    suffix = "%23" + quote(heading, safe="") if heading else ""
 
     return {
-        "without_md": _build(without_md),
-        "with_md": _build(with_md),
+        "without_md": prefix + _encode_path(without_md) + suffix,
+        "with_md": prefix + _encode_path(with_md) + suffix,
     }
 
 
@@ -611,18 +895,59 @@ def obsidian_open_url(vault_name: str, open_path: str, heading: str | None = Non
 
     Use the .md extension form for better compatibility.
     """
-    return obsidian_open_urls(vault_name, open_path, heading=heading)["with_md"]
+    # Same as obsidian_open_urls(...)["with_md"] without building the unused variant
+    norm = open_path.replace("\\", "/")
+    if not norm.lower().endswith(".md"):
+        norm += ".md"
+    url = _open_url_prefix(vault_name) + _encode_path(norm)
+    return url + "%23" + quote(heading, safe="") if heading else url
+
+
+def _open_found(vault: str, open_path: str, heading: str | None, source: str, candidates: list, meta: dict) -> dict:
+    urls = obsidian_open_urls(vault, open_path, heading=heading)
+    return {
+        "found": True,
+        "source": source,
+        "open_path": open_path,
+        "obsidian_url": urls["without_md"],
+        "obsidian_urls": urls,
+        "candidates": candidates,
+        **meta
+    }
 
 
 @app.get("/open", dependencies=[Depends(require_api_key)])
-def open_for_shortcuts(
+async def open_for_shortcuts(
     q: str = Query(..., min_length=1),
     vault: str = Query(..., min_length=1),
     prefer: str = Query(default="most_hits"),
     heading: str | None = Query(default=None),
+    classify: bool = Query(default=False, description="Route through intent classification like /assistant"),
 ):
+    if not classify:
+        # The endpoint already fixes the intent to "open": resolve directly, no classifier/routing
+        start_time = time.monotonic()
+        rr = await asyncio.to_thread(
+            resolve_query, query=q, vault_root=VAULT_ROOT, commands_file=COMMANDS_FILE, prefer=prefer
+        )
+        meta = {
+            "session_id": None,
+            "duration_ms": (time.monotonic() - start_time) * 1000,
+            "intent": Intent.OPEN.value,
+            "confidence": None
+        }
+        if rr.found and rr.open_path and not rr.open_path.startswith("_special:"):
+            return _open_found(vault, rr.open_path, heading, rr.source or "unknown", rr.candidates, meta)
+        return {
+            "found": False,
+            "obsidian_url": None,
+            "reason": rr.reason or "No openable note for this query",
+            **meta
+        }
+
     # Use the new orchestrator system with enhanced logging
-    result = ASSISTANT.run(
+    result = await asyncio.to_thread(
+        ASSISTANT.run,
         query=q,
         vault_name=vault,
         prefer=prefer,
@@ -630,37 +955,31 @@ def open_for_shortcuts(
         section=None,
     )
     
+    # Include orchestrator metadata for debugging
+    meta = {
+        "session_id": result.get("session_id"),
+        "duration_ms": result.get("duration_ms"),
+        "intent": result.get("intent"),
+        "confidence": result.get("confidence")
+    }
+    
     # Transform orchestrator response to match /open API format for backward compatibility
     if result.get("success", False) and result.get("obsidian_url"):
-        urls = obsidian_open_urls(vault, result.get("open_path", ""), heading=heading)
-        return {
-            "found": True,
-            "source": result.get("source", "unknown"),
-            "open_path": result.get("open_path", ""),
-            "obsidian_url": urls["without_md"],
-            "obsidian_urls": urls,
-            "candidates": result.get("candidates", []),
-            # Include orchestrator metadata for debugging
-            "session_id": result.get("session_id"),
-            "duration_ms": result.get("duration_ms"),
-            "intent": result.get("intent"),
-            "confidence": result.get("confidence")
-        }
+        return _open_found(
+            vault, result.get("open_path", ""), heading,
+            result.get("source", "unknown"), result.get("candidates", []), meta
+        )
     else:
         return {
             "found": False,
             "obsidian_url": None,
             "reason": result.get("reason", result.get("user_message", "Unknown error")),
-            # Include orchestrator metadata for debugging
-            "session_id": result.get("session_id"),
-            "duration_ms": result.get("duration_ms"),
-            "intent": result.get("intent"),
-            "confidence": result.get("confidence")
+            **meta
         }
 
 
 @app.get("/assistant", dependencies=[Depends(require_api_key)])
-def assistant(
+async def assistant(
     q: str = Query(..., min_length=1, description="User query / voice command"),
     vault: str = Query(..., min_length=1, description="Mac側ObsidianのVault名（表示名）"),
     prefer: str = Query(default="most_hits"),
@@ -670,7 +989,8 @@ def assistant(
     css_theme: str | None = Query(default=None, description="CSS theme for HTML: obsidian|light|dark|minimal"),
     mobile: bool | None = Query(default=None, description="Mobile optimization for HTML")
 ):
-    result = ASSISTANT.run(
+    result = await asyncio.to_thread(
+        ASSISTANT.run,
         query=q,
         vault_name=vault,
         prefer=prefer,
@@ -678,7 +998,7 @@ def assistant(
         section=section,
     )
     
-    return _format_response(
+    return await _format_response_async(
         data=result,
         format=format,
         content_type="assistant",
@@ -690,7 +1010,7 @@ def assistant(
 
 # Core HTML endpoints
 @app.post("/render_html", dependencies=[Depends(require_api_key)])
-def render_html(
+async def render_html(
     content: dict,
     css_theme: str | None = Query(default=None, description="CSS theme: obsidian|light|dark|minimal"),
     mobile: bool | None = Query(default=None, description="Mobile optimization"),
@@ -702,59 +1022,137 @@ def render_html(
     if not markdown_text:
         raise HTTPException(400, detail="Missing 'markdown' field in request body")
     
-    renderer = HtmlRenderer(
-        theme=css_theme,
-        mobile_optimized=mobile
-    )
-    
-    html_content = renderer.render(markdown_text, title)
+    renderer = _get_renderer(css_theme, mobile)
+    html_content = await asyncio.to_thread(renderer.render_bytes, markdown_text, title)
     return Response(content=html_content, media_type="text/html; charset=utf-8")
 
 
+@app.get("/static/{name}")
+async def static_asset(name: str):
+    """Content-addressed CSS/JS referenced by pages rendered with HTML_ASSETS=external"""
+    asset = get_static_asset(name)
+    if asset is None:
+        raise HTTPException(404, detail="Asset not found")
+    body, media_type = asset
+    # The name changes with the content, so the body never goes stale
+    return Response(content=body, media_type=media_type, headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+
 @app.get("/view_html", dependencies=[Depends(require_api_key)])
-def view_html(
+async def view_html(
+    request: Request,
     path: str = Query(..., description="Vault-relative path to markdown file"),
     css_theme: str | None = Query(default=None, description="CSS theme: obsidian|light|dark|minimal"),
     mobile: bool | None = Query(default=None, description="Mobile optimization")
 ):
     """View a specific markdown file as HTML"""
-    if not VAULT_ROOT.exists():
-        raise HTTPException(500, detail="VAULT_ROOT not found")
-    
     try:
         p = safe_join(VAULT_ROOT, path)
     except ValueError as e:
         raise HTTPException(400, detail=str(e))
     
-    if not p.exists():
+    try:
+        st = await asyncio.to_thread(p.stat)
+    except FileNotFoundError:
         raise HTTPException(404, detail="Note not found")
     
     if not path.lower().endswith('.md'):
         raise HTTPException(400, detail="Only .md files are supported")
     
+    etag = _variant_etag(st.st_mtime_ns, st.st_size, css_theme, mobile)
+    validators = _note_validators(etag, st)
+    if _note_not_modified(request, etag, st):
+        return Response(status_code=304, headers=validators)
+    
+    html_key = ("view", path, etag)
+    html_content = _HTML_RESPONSE_CACHE.get(html_key)
+    if html_content is not None:
+        response = _html_response(html_content)
+        response.headers.update(validators)
+        return response
+    
     # Read markdown content
     try:
-        markdown_content = p.read_text(encoding="utf-8", errors="ignore")
+        markdown_content, _, _ = await asyncio.to_thread(read_note, p, st)
     except Exception as e:
         raise HTTPException(500, detail=f"Failed to read file: {str(e)}")
     
     # Create title from filename
-    filename = path.split('/')[-1] if '/' in path else path
-    filename = filename.replace('.md', '')
-    title = f"ノート: {filename}"
+    title = f"ノート: {note_name(path)}"
     
-    # Render HTML
-    renderer = HtmlRenderer(
-        theme=css_theme,
-        mobile_optimized=mobile
+    # Stream the document: the head (CSS/JS) goes out before the body is converted.
+    # Starlette iterates this sync generator in its thread pool.
+    renderer = _get_renderer(css_theme, mobile)
+    return StreamingResponse(
+        _caching_iter(renderer.render_iter(markdown_content, title), html_key),
+        media_type="text/html; charset=utf-8",
+        headers={**validators, "Cache-Control": _HTML_CACHE_CONTROL}
     )
-    
-    html_content = renderer.render(markdown_content, title)
-    return Response(content=html_content, media_type="text/html; charset=utf-8")
+
+
+def _caching_iter(chunks: Iterator[bytes], cache_key: tuple) -> Iterator[bytes]:
+    """Pass chunks through, storing the joined document once the stream completes.
+
+    Once the document outgrows _HTML_CACHE_MAX_BYTES the chunks are no longer
+    held, so large notes stream without a second copy in memory.
+    """
+    parts = []
+    size = 0
+    for chunk in chunks:
+        if parts is not None:
+            size += len(chunk)
+            if size <= _HTML_CACHE_MAX_BYTES:
+                parts.append(chunk)
+            else:
+                parts = None
+        yield chunk
+    if parts is not None:
+        _HTML_RESPONSE_CACHE.put(cache_key, b"".join(parts))
+
+
+def _write_text_and_size(full_path: Path, markdown_content: str) -> int:
+    """Write a note and return its size on disk (runs in a worker thread)"""
+    full_path.write_text(markdown_content, encoding="utf-8")
+    invalidate_note(full_path)
+    invalidate_search_text(full_path)
+    clear_resolve_cache()  # the new text may change which note a query resolves to
+    return full_path.stat().st_size
+
+
+# Queued save_md jobs as (job_id, full_path, markdown_content, overwrite); set up by lifespan
+_save_queue: asyncio.Queue | None = None
+_save_logger = setup_orchestrator_logger("save_md")
+
+
+def _write_batch(jobs: list[tuple[str, Path, str, bool]]) -> None:
+    """Write every queued note in a single worker-thread hop"""
+    for job_id, full_path, markdown_content, overwrite in jobs:
+        try:
+            if not overwrite and full_path.exists():
+                _save_logger.warning(f"⏭️ Skipped {job_id}: {full_path.name} already exists")
+                continue
+            file_size = _write_text_and_size(full_path, markdown_content)
+            _save_logger.info(f"💾 Saved {job_id}: {full_path.name} ({file_size} bytes)")
+        except Exception as e:
+            _save_logger.error(f"❌ Failed to save {job_id}: {e}")
+
+
+async def _save_writer(queue: asyncio.Queue) -> None:
+    """Drain the save queue, writing whatever has accumulated as one batch"""
+    while True:
+        jobs = [await queue.get()]
+        while not queue.empty():
+            jobs.append(queue.get_nowait())
+        try:
+            await asyncio.to_thread(_write_batch, jobs)
+            _invalidate_files_cache()
+        finally:
+            for _ in jobs:
+                queue.task_done()
 
 
 @app.post("/save_md", dependencies=[Depends(require_api_key)])
-def save_markdown(
+async def save_markdown(
     content: dict
 ):
     """Save markdown content to vault (restricted to configured write directory)"""
@@ -768,9 +1166,6 @@ def save_markdown(
     if not path.lower().endswith('.md'):
         raise HTTPException(400, detail="Only .md files are supported")
     
-    if not VAULT_ROOT.exists():
-        raise HTTPException(500, detail="VAULT_ROOT not found")
-    
     # Ensure path is restricted to vault_write_root for safety
     write_root_name = settings.vault_write_root
     if write_root_name:
@@ -788,20 +1183,32 @@ def save_markdown(
         raise HTTPException(400, detail=str(e))
     
     # Create parent directory if it doesn't exist
-    full_path.parent.mkdir(parents=True, exist_ok=True)
+    await asyncio.to_thread(full_path.parent.mkdir, parents=True, exist_ok=True)
     
     # Check if file exists and overwrite setting
-    file_existed = full_path.exists()
+    file_existed = await asyncio.to_thread(full_path.exists)
     if file_existed and not overwrite:
         raise HTTPException(409, detail="File already exists and overwrite=false")
     
+    relative_path = str(full_path.relative_to(VAULT_ROOT)).replace("\\", "/")
+    
+    # Fire-and-forget: hand the write to the background writer and answer immediately
+    if content.get("async_write", False) and _save_queue is not None:
+        job_id = uuid.uuid4().hex
+        _save_queue.put_nowait((job_id, full_path, markdown_content, overwrite))
+        return {
+            "success": True,
+            "accepted": True,
+            "job_id": job_id,
+            "path": relative_path,
+            "write_root_restricted": bool(write_root_name),
+            "write_root": write_root_name
+        }
+    
     try:
-        # Write the markdown content
-        full_path.write_text(markdown_content, encoding="utf-8")
-        
-        # Get file stats for response
-        file_size = full_path.stat().st_size
-        relative_path = str(full_path.relative_to(VAULT_ROOT)).replace("\\", "/")
+        # Write the markdown content and get file stats for response
+        file_size = await asyncio.to_thread(_write_text_and_size, full_path, markdown_content)
+        _invalidate_files_cache()
         
         return {
             "success": True,
@@ -816,12 +1223,126 @@ def save_markdown(
         raise HTTPException(500, detail=f"Failed to save file: {str(e)}")
 
 
+@app.post("/cache/clear", dependencies=[Depends(require_api_key)])
+async def clear_caches():
+    """Drop the per-worker response and note caches"""
+    html_entries = len(_HTML_RESPONSE_CACHE)
+    _HTML_RESPONSE_CACHE.clear()
+    clear_note_cache()
+    clear_search_cache()
+    clear_resolve_cache()
+    clear_fragment_cache()
+    _invalidate_files_cache()
+    return {"success": True, "html_entries_cleared": html_entries}
+
+
+def _utc_timestamp() -> str:
+    """ISO 8601 UTC timestamp with microseconds, built straight from time.time_ns()"""
+    secs, ns = divmod(time.time_ns(), 1_000_000_000)
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(secs))}.{ns // 1000:06d}Z"
+
+
+# /test search probe result, cached per worker as (monotonic timestamp, hit count)
+_SEARCH_PROBE_TTL = 60.0
+_search_probe_cache: tuple[float, int] | None = None
+_search_probe_lock = threading.Lock()
+
+
+def _cached_search_probe_count() -> int:
+    """Run the /test search probe at most once per TTL and return its hit count"""
+    global _search_probe_cache
+    with _search_probe_lock:
+        now = time.monotonic()
+        if _search_probe_cache and now - _search_probe_cache[0] < _SEARCH_PROBE_TTL:
+            return _search_probe_cache[1]
+        count = len(grep_vault(VAULT_ROOT, "test"))
+        _search_probe_cache = (now, count)
+        return count
+
+
+# Each /test probe is a blocking function returning (name, passed, details) entries
+def _probe_vault() -> list[tuple[str, bool, str]]:
+    """Test 1: Vault accessibility"""
+    # A single directory read answers both "exists" and "has .md files"
+    try:
+        with os.scandir(VAULT_ROOT) as it:
+            md_count = sum(1 for entry in it if entry.name.endswith(".md") and entry.is_file())
+        return [
+            ("Vault Root Exists", True, f"Path: {VAULT_ROOT}"),
+            ("Has MD Files", md_count > 0, f"Found {md_count} .md files"),
+        ]
+    except FileNotFoundError:
+        return [("Vault Root Exists", False, f"Path: {VAULT_ROOT}")]
+    except Exception as e:
+        return [("Vault Root Exists", False, f"Error: {str(e)}")]
+
+
+def _probe_classifier() -> list[tuple[str, bool, str]]:
+    """Test 2: Intent classifier"""
+    try:
+        classifier = create_classifier()
+        test_query = "テスト"
+        intent_result, metrics = classifier.classify(test_query)
+        
+        return [("Intent Classification", 
+                 intent_result.intent in [Intent.OPEN, Intent.SEARCH, Intent.READ, Intent.SUMMARIZE, Intent.COMMENT, Intent.UPDATE, Intent.TABLE, Intent.UNKNOWN],
+                 f"Intent: {intent_result.intent.value}, Confidence: {intent_result.confidence:.2f}, Model: {metrics.model_used}")]
+    except Exception as e:
+        return [("Intent Classification", False, f"Error: {str(e)}")]
+
+
+def _probe_renderer() -> list[tuple[str, bool, str]]:
+    """Test 3: HTML renderer"""
+    try:
+        renderer = _get_renderer(None, None)
+        test_md = "# Test\n\nThis is **bold** text."
+        html = renderer.render(test_md, "Test")
+        
+        has_html_structure = all(tag in html for tag in ["<html>", "<body>", "<h1>", "<strong>"])
+        return [("HTML Rendering", has_html_structure, f"Generated {len(html)} chars")]
+    except Exception as e:
+        return [("HTML Rendering", False, f"Error: {str(e)}")]
+
+
+def _probe_config() -> list[tuple[str, bool, str]]:
+    """Test 4: Configuration"""
+    try:
+        config_ok = all([
+            hasattr(settings, 'vault_root'),
+            hasattr(settings, 'aisecretary_api_key'),
+            hasattr(settings, 'css_theme')
+        ])
+        return [("Configuration", config_ok, f"Theme: {getattr(settings, 'css_theme', 'N/A')}")]
+    except Exception as e:
+        return [("Configuration", False, f"Error: {str(e)}")]
+
+
+def _probe_search() -> list[tuple[str, bool, str]]:
+    """Test 5: Search functionality"""
+    try:
+        if VAULT_ROOT.exists():
+            count = _cached_search_probe_count()
+            return [("Search Engine", True, f"Search completed, found {count} results")]
+        return [("Search Engine", False, "Vault not accessible")]
+    except Exception as e:
+        return [("Search Engine", False, f"Error: {str(e)}")]
+
+
+_TEST_PROBES = (
+    ("Vault Root Exists", _probe_vault),
+    ("Intent Classification", _probe_classifier),
+    ("HTML Rendering", _probe_renderer),
+    ("Configuration", _probe_config),
+    ("Search Engine", _probe_search),
+)
+
+
 @app.get("/test")
-def run_simple_tests():
+async def run_simple_tests():
     """Run simple in-app tests to verify functionality"""
     
     results = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _utc_timestamp(),
         "tests": [],
         "summary": {
             "total": 0,
@@ -842,60 +1363,18 @@ def run_simple_tests():
         else:
             results["summary"]["failed"] += 1
     
-    # Test 1: Vault accessibility
-    try:
-        vault_exists = VAULT_ROOT.exists()
-        add_test("Vault Root Exists", vault_exists, f"Path: {VAULT_ROOT}")
-        
-        if vault_exists:
-            md_files = list(VAULT_ROOT.glob("*.md"))
-            add_test("Has MD Files", len(md_files) > 0, f"Found {len(md_files)} .md files")
-    except Exception as e:
-        add_test("Vault Root Exists", False, f"Error: {str(e)}")
-    
-    # Test 2: Intent classifier
-    try:
-        classifier = create_classifier()
-        test_query = "テスト"
-        intent_result, metrics = classifier.classify(test_query)
-        
-        add_test("Intent Classification", 
-                intent_result.intent in [Intent.OPEN, Intent.SEARCH, Intent.READ, Intent.SUMMARIZE, Intent.COMMENT, Intent.UPDATE, Intent.TABLE, Intent.UNKNOWN],
-                f"Intent: {intent_result.intent.value}, Confidence: {intent_result.confidence:.2f}, Model: {metrics.model_used}")
-    except Exception as e:
-        add_test("Intent Classification", False, f"Error: {str(e)}")
-    
-    # Test 3: HTML renderer
-    try:
-        renderer = HtmlRenderer()
-        test_md = "# Test\n\nThis is **bold** text."
-        html = renderer.render(test_md, "Test")
-        
-        has_html_structure = all(tag in html for tag in ["<html>", "<body>", "<h1>", "<strong>"])
-        add_test("HTML Rendering", has_html_structure, f"Generated {len(html)} chars")
-    except Exception as e:
-        add_test("HTML Rendering", False, f"Error: {str(e)}")
-    
-    # Test 4: Configuration
-    try:
-        config_ok = all([
-            hasattr(settings, 'vault_root'),
-            hasattr(settings, 'aisecretary_api_key'),
-            hasattr(settings, 'css_theme')
-        ])
-        add_test("Configuration", config_ok, f"Theme: {getattr(settings, 'css_theme', 'N/A')}")
-    except Exception as e:
-        add_test("Configuration", False, f"Error: {str(e)}")
+    # The probes are independent, so run them concurrently in worker threads
+    outcomes = await asyncio.gather(
+        *(asyncio.to_thread(probe) for _, probe in _TEST_PROBES),
+        return_exceptions=True
+    )
     
-    # Test 5: Search functionality
-    try:
-        if VAULT_ROOT.exists():
-            search_results = grep_vault("test", VAULT_ROOT)
-            add_test("Search Engine", True, f"Search completed, found {len(search_results)} results")
-        else:
-            add_test("Search Engine", False, "Vault not accessible")
-    except Exception as e:
-        add_test("Search Engine", False, f"Error: {str(e)}")
+    for (name, _), outcome in zip(_TEST_PROBES, outcomes):
+        if isinstance(outcome, BaseException):
+            add_test(name, False, f"Error: {str(outcome)}")
+            continue
+        for entry in outcome:
+            add_test(*entry)
     
     return results
 
@@ -969,7 +1448,7 @@ def test_html_rendering(
     """Test HTML rendering with different themes"""
     
     try:
-        renderer = HtmlRenderer(theme=theme, mobile_optimized=mobile)
+        renderer = _get_renderer(theme, mobile)
         
         test_markdown = """# テストページ
 
@@ -995,17 +1474,17 @@ print("Hello, World!")
 [AIsecretary Documentation](../README.md)
 """
         
-        html = renderer.render(test_markdown, "テスト")
+        rendered = renderer.render_result(test_markdown, "テスト")
         
         # Return just metrics for JSON response
         return {
             "theme": theme,
             "mobile_optimized": mobile,
             "result": {
-                "html_size": len(html),
-                "has_css": "style>" in html,
-                "has_content": "テストページ" in html,
-                "mobile_meta": 'viewport' in html if mobile else "N/A"
+                "html_size": rendered.size,
+                "has_css": rendered.has_css,
+                "has_content": rendered.has_content,
+                "mobile_meta": rendered.has_viewport if mobile else "N/A"
             },
             "sample_url": f"/test/html/view?theme={theme}&mobile={mobile}"
         }
@@ -1017,17 +1496,18 @@ print("Hello, World!")
         }
 
 
-@app.get("/test/html/view")
-def view_test_html(
-    theme: str = Query("obsidian", description="CSS theme"),
-    mobile: bool = Query(True, description="Mobile optimization")
-):
-    """View test HTML rendering (returns actual HTML)"""
+# Prebuilt error page for /test/html/view; the exception text is escaped and spliced in
+_TEST_ERROR_HTML = """<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><title>Test Error</title></head>
+<body><h1>テストエラー</h1><p>Error: {err}</p></body></html>""".encode("utf-8")
+
+
+@lru_cache(maxsize=32)
+def _render_test_page(theme: str, mobile: bool) -> tuple[bytes, str]:
+    """Render the /test/html/view page once per (theme, mobile) and return (body, ETag)"""
+    renderer = _get_renderer(theme, mobile)
     
-    try:
-        renderer = HtmlRenderer(theme=theme, mobile_optimized=mobile)
-        
-        test_markdown = """# テストページ - {theme}
+    test_markdown = """# テストページ - {theme}
 
 これは**太字**テキストと*斜体*テキストです。
 
@@ -1061,13 +1541,30 @@ print("Mobile: {mobile}")
 
 **テスト完了** - {theme} テーマ、モバイル最適化: {mobile}
 """.format(theme=theme, mobile="有効" if mobile else "無効")
-        
-        html = renderer.render(test_markdown, f"テスト - {theme}")
-        
-        return Response(content=html, media_type="text/html; charset=utf-8")
-        
+    
+    body = renderer.render_bytes(test_markdown, f"テスト - {theme}")
+    return body, f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+@app.get("/test/html/view")
+def view_test_html(
+    request: Request,
+    theme: str = Query("obsidian", description="CSS theme"),
+    mobile: bool = Query(True, description="Mobile optimization")
+):
+    """View test HTML rendering (returns actual HTML)"""
+    
+    try:
+        body, etag = _render_test_page(theme, mobile)
     except Exception as e:
-        error_html = f"""<!DOCTYPE html>
-<html><head><meta charset="UTF-8"><title>Test Error</title></head>
-<body><h1>テストエラー</h1><p>Error: {str(e)}</p></body></html>"""
+        error_html = _TEST_ERROR_HTML.replace(b"{err}", escape_html(str(e)).encode("utf-8"))
         return Response(content=error_html, media_type="text/html; charset=utf-8")
+    
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    return Response(
+        content=body,
+        media_type="text/html; charset=utf-8",
+        headers={"ETag": etag, "Cache-Control": "public, max-age=300"}
+    )
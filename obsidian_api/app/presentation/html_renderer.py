@@ -5,15 +5,209 @@ Converts Markdown to styled HTML for iOS Shortcuts and web display
 
 from __future__ import annotations
 
-import markdown
-from markdown.extensions import tables, fenced_code, toc, codehilite
-from typing import Optional
+import hashlib
+import queue
+import re
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterator, NamedTuple, Optional
+from ..cache import LRUCache
 from ..config import settings
 
+if TYPE_CHECKING:
+    import markdown
+
+try:
+    # Optional: C-backed CommonMark/GFM parser, used when MARKDOWN_BACKEND=cmark
+    import cmarkgfm
+    from cmarkgfm.cmark import Options as CmarkOptions
+except ImportError:  # pragma: no cover
+    cmarkgfm = None
+    CmarkOptions = None
+
+try:
+    # Optional: pure-Python parser several times faster than Python-Markdown (MARKDOWN_BACKEND=mistune)
+    import mistune
+except ImportError:  # pragma: no cover
+    mistune = None
+
+
+class RenderResult(NamedTuple):
+    """Rendered HTML document plus facts recorded while building it"""
+    html: str
+    size: int
+    has_css: bool
+    has_content: bool
+    has_viewport: bool
+
+
+# Fixed start of every document, up to the <title> element
+DOCUMENT_HEAD_START = """<!DOCTYPE html>
+<html lang="ja">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <meta name="apple-mobile-web-app-capable" content="yes">
+    <meta name="apple-mobile-web-app-status-bar-style" content="default">
+"""
+
+# Closing markup emitted after the rendered article body
+DOCUMENT_TAIL = """
+    </article>
+</body>
+</html>"""
+
+# Pre-encoded fixed parts for render_bytes()
+_HEAD_START_BYTES = (DOCUMENT_HEAD_START + "    <title>").encode("utf-8")
+_TITLE_END_BYTES = b"</title>\n"
+_TAIL_BYTES = DOCUMENT_TAIL.encode("utf-8")
+
+
+def _new_markdown() -> markdown.Markdown:
+    """Markdown processor with the common extensions used by every renderer"""
+    # Imported on first use (~30ms with fenced_code pulling in Pygments' lexer map);
+    # processes that never render, or use another backend, don't pay for it
+    import markdown
+    
+    return markdown.Markdown(
+        extensions=[
+            'tables',           # Table support
+            'fenced_code',      # ```code blocks
+            'toc',              # Table of contents
+            'nl2br',            # Newlines to <br>
+        ],
+        # No codehilite: without Pygments it only added class="highlight" to indented
+        # code blocks (nothing styles it) while rerouting every fenced block through itself
+    )
+
+
+# Idle Markdown processors shared by all renderers. A processor isn't thread-safe, so each
+# conversion checks one out; a new one is only built when every pooled one is busy.
+_MD_POOL: queue.SimpleQueue = queue.SimpleQueue()
+
+
+# GFM extensions matching the Python-Markdown set; HARDBREAKS stands in for nl2br and
+# UNSAFE keeps raw HTML passthrough like Python-Markdown does
+_CMARK_EXTENSIONS = ["table", "autolink", "strikethrough"]
+_CMARK_OPTIONS = (CmarkOptions.CMARK_OPT_UNSAFE | CmarkOptions.CMARK_OPT_HARDBREAKS) if CmarkOptions else 0
+_USE_CMARK = settings.markdown_backend == "cmark" and cmarkgfm is not None
+
+# Same feature set for mistune: hard_wrap for nl2br, escape=False for raw HTML passthrough.
+# Its parser keeps per-call state only, so one instance serves every thread.
+_MISTUNE = (
+    mistune.create_markdown(escape=False, hard_wrap=True, plugins=["table", "strikethrough", "url"])
+    if settings.markdown_backend == "mistune" and mistune is not None
+    else None
+)
+
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r" ?([{};]) ?")
+
+
+def minify_css(css: str) -> str:
+    """Drop comments and collapse whitespace; spaces around { } ; are removed entirely"""
+    css = _CSS_SPACE_RE.sub(" ", _CSS_COMMENT_RE.sub("", css))
+    return _CSS_PUNCT_RE.sub(r"\1", css).strip()
+
+
+# Stylesheets/scripts by content-addressed file name, registered by renderers for
+# HTML_ASSETS=external; the hash in the name lets clients cache them indefinitely
+_STATIC_ASSETS: dict[str, tuple[bytes, str]] = {}
+
+
+def _register_asset(prefix: str, body: str, suffix: str, media_type: str) -> str:
+    """Store an asset under prefix-<hash>.suffix and return its URL"""
+    data = body.encode("utf-8")
+    name = f"{prefix}-{hashlib.blake2b(data, digest_size=8).hexdigest()}.{suffix}"
+    _STATIC_ASSETS[name] = (data, media_type)
+    return f"{settings.html_asset_base_url}/static/{name}"
+
+
+def get_static_asset(name: str) -> tuple[bytes, str] | None:
+    """(body, media type) of a registered asset.
+
+    Names are deterministic, so a worker that has not rendered the page
+    (another process, or one restarted since) builds every variant once.
+    """
+    asset = _STATIC_ASSETS.get(name)
+    if asset is None and settings.html_assets == "external":
+        _register_all_assets()
+        asset = _STATIC_ASSETS.get(name)
+    return asset
+
+
+@lru_cache(maxsize=1)
+def _register_all_assets() -> None:
+    """Build a renderer per theme and mobile setting; each registers its CSS and the JS"""
+    for theme in HtmlRenderer._THEME_METHODS:
+        for mobile in (True, False):
+            HtmlRenderer(theme=theme, mobile_optimized=mobile)
+
+
+def minify_js(js: str) -> str:
+    """Drop indentation, blank lines and whole-line // comments.
+
+    Line breaks are kept, so automatic semicolon insertion and template
+    literals behave exactly as in the source.
+    """
+    lines = (line.strip() for line in js.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+# Converted fragments keyed on a digest of the source; the fragment doesn't depend on
+# theme, title or metadata, so every renderer shares it. Huge notes are not kept.
+_FRAGMENT_CACHE = LRUCache(maxsize=256)
+_FRAGMENT_CACHE_MAX_CHARS = 1 << 19
+
+
+def convert_markdown(markdown_text: str) -> str:
+    """Convert Markdown to an HTML fragment, reusing the result for a recently seen source"""
+    if len(markdown_text) > _FRAGMENT_CACHE_MAX_CHARS:
+        return _convert_markdown_uncached(markdown_text)
+    key = hashlib.blake2b(markdown_text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    html_content = _FRAGMENT_CACHE.get(key)
+    if html_content is None:
+        html_content = _convert_markdown_uncached(markdown_text)
+        _FRAGMENT_CACHE.put(key, html_content)
+    return html_content
+
+
+def clear_fragment_cache() -> None:
+    _FRAGMENT_CACHE.clear()
+
+
+def _convert_markdown_uncached(markdown_text: str) -> str:
+    """Convert Markdown to an HTML fragment using a pooled, freshly reset processor"""
+    if _USE_CMARK:
+        # No heading ids (toc) on this path
+        return cmarkgfm.markdown_to_html_with_extensions(
+            markdown_text, options=_CMARK_OPTIONS, extensions=_CMARK_EXTENSIONS
+        )
+    if _MISTUNE is not None:
+        # No heading ids (toc) on this path either
+        return _MISTUNE(markdown_text)
+    try:
+        md = _MD_POOL.get_nowait()
+    except queue.Empty:
+        md = _new_markdown()
+    try:
+        return md.reset().convert(markdown_text)
+    finally:
+        _MD_POOL.put(md)
+
 
 class HtmlRenderer:
     """HTML renderer with configurable CSS themes and mobile optimization"""
     
+    # Theme name -> CSS builder; only the selected theme's CSS is produced
+    _THEME_METHODS = {
+        "obsidian": "_get_obsidian_theme",
+        "light": "_get_light_theme",
+        "dark": "_get_dark_theme",
+        "minimal": "_get_minimal_theme",
+    }
+    
     def __init__(
         self, 
         theme: Optional[str] = None, 
@@ -27,69 +221,109 @@ class HtmlRenderer:
         self.font_size = font_size or settings.html_font_size
         self.max_width = max_width or settings.html_max_width
         
-        # Configure markdown processor with common extensions
-        self.md = markdown.Markdown(
-            extensions=[
-                'tables',           # Table support
-                'fenced_code',      # ```code blocks
-                'toc',              # Table of contents
-                'codehilite',       # Syntax highlighting
-                'nl2br',            # Newlines to <br>
-            ],
-            extension_configs={
-                'codehilite': {
-                    'css_class': 'highlight',
-                    'use_pygments': False,  # Use CSS-only highlighting
-                }
-            }
-        )
+        # CSS and script depend only on the settings above, so the document head
+        # after <title> is built once per renderer
+        self._css = self._get_complete_css()
+        javascript = self._get_obsidian_javascript()
+        if settings.minify_assets:
+            self._css = minify_css(self._css)
+            javascript = minify_js(javascript)
+        if settings.html_assets == "external":
+            # Known theme names only: css_theme comes from the query string
+            theme_name = self.theme if self.theme in self._THEME_METHODS else "obsidian"
+            css_url = _register_asset(f"aisec-{theme_name}", self._css, "css", "text/css; charset=utf-8")
+            js_url = _register_asset("aisec", javascript, "js", "text/javascript; charset=utf-8")
+            self._inline_css = False
+            assets = f"""    <link rel="stylesheet" href="{css_url}">
+    <script src="{js_url}"></script>"""
+        else:
+            self._inline_css = bool(self._css)
+            assets = f"""    <style>
+{self._css}
+    </style>
+    <script>
+{javascript}
+    </script>"""
+        self._head_tail = f"""{assets}
+</head>
+<body>
+    <article class="markdown-body">
+        """
+        self._head_tail_bytes = self._head_tail.encode("utf-8")
     
     def render(self, markdown_text: str, title: str = "AIsecretary", metadata: dict = None) -> str:
         """Convert Markdown to styled HTML with optional metadata"""
+        return self.render_result(markdown_text, title, metadata).html
+    
+    def render_result(self, markdown_text: str, title: str = "AIsecretary", metadata: dict = None) -> RenderResult:
+        """Render like render(), also reporting what was emitted so callers need not rescan the HTML"""
         # Convert markdown to HTML
-        html_content = self.md.convert(markdown_text)
-        
-        # Generate CSS
-        css = self._get_complete_css()
+        html_content = convert_markdown(markdown_text)
         
         # Build complete HTML document
-        return self._build_html_document(html_content, css, title, metadata)
+        document = self._build_html_document(html_content, title, metadata)
+        return RenderResult(
+            html=document,
+            size=len(document),
+            has_css=self._inline_css,
+            has_content=bool(html_content),
+            has_viewport=True,  # the document head always carries the viewport meta tag
+        )
     
-    def _build_html_document(self, content: str, css: str, title: str, metadata: dict = None) -> str:
-        """Build complete HTML document with Obsidian link handling and metadata"""
-        javascript = self._get_obsidian_javascript()
-        
-        # Add metadata as hidden elements for Shortcuts access
-        metadata_elements = ""
-        if metadata:
-            for key, value in metadata.items():
-                safe_key = self._escape_html(str(key))
-                safe_value = self._escape_html(str(value))
-                metadata_elements += f'    <meta name="shortcut-{safe_key}" content="{safe_value}">\n'
+    def render_bytes(self, markdown_text: str, title: str = "AIsecretary", metadata: dict = None) -> bytes:
+        """render() encoded as UTF-8, joined from pre-encoded fixed parts"""
+        html_content = convert_markdown(markdown_text)
+        return b"".join(self._head_parts(title, metadata) + [html_content.encode("utf-8"), _TAIL_BYTES])
+    
+    def render_iter(self, markdown_text: str, title: str = "AIsecretary", metadata: dict = None) -> Iterator[bytes]:
+        """Yield the same document as render(), sending the head before the body is converted"""
+        yield b"".join(self._head_parts(title, metadata))
         
-        return f"""<!DOCTYPE html>
-<html lang="ja">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="apple-mobile-web-app-capable" content="yes">
-    <meta name="apple-mobile-web-app-status-bar-style" content="default">
-    <title>{self._escape_html(title)}</title>
-{metadata_elements}    <style>
-{css}
-    </style>
-    <script>
-{javascript}
-    </script>
-</head>
-<body>
-    <article class="markdown-body">
-        {content}
-    </article>
-</body>
-</html>"""
+        # Body and tail go out separately; concatenating would copy a large body again
+        yield convert_markdown(markdown_text).encode("utf-8")
+        yield _TAIL_BYTES
+    
+    def _build_html_document(self, content: str, title: str, metadata: dict = None) -> str:
+        """Build complete HTML document with Obsidian link handling and metadata"""
+        # One join copies the (possibly large) content once; + chains would copy it per step
+        return "".join((
+            DOCUMENT_HEAD_START,
+            "    <title>",
+            self._escape_html(title),
+            "</title>\n",
+            self._metadata_elements(metadata),
+            self._head_tail,
+            content,
+            DOCUMENT_TAIL,
+        ))
+    
+    def _head_parts(self, title: str, metadata: dict = None) -> list[bytes]:
+        """Document head (up to the article body) as byte chunks; only title and metadata are encoded per call"""
+        return [
+            _HEAD_START_BYTES,
+            self._escape_html(title).encode("utf-8"),
+            _TITLE_END_BYTES,
+            self._metadata_elements(metadata).encode("utf-8"),
+            self._head_tail_bytes,
+        ]
+    
+    def _metadata_elements(self, metadata: dict = None) -> str:
+        """Metadata as hidden <meta> elements for Shortcuts access"""
+        if not metadata:
+            return ""
+        # Keyed on the string forms (True and 1 hash alike); the same few shortcut dicts repeat
+        return self._format_metadata(tuple((str(key), str(value)) for key, value in metadata.items()))
+    
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _format_metadata(cls, items: tuple[tuple[str, str], ...]) -> str:
+        return "".join(
+            f'    <meta name="shortcut-{cls._escape_html(key)}" content="{cls._escape_html(value)}">\n'
+            for key, value in items
+        )
     
-    def _escape_html(self, text: str) -> str:
+    @staticmethod
+    def _escape_html(text: str) -> str:
         """Escape HTML entities"""
         return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
     
@@ -100,13 +334,16 @@ class HtmlRenderer:
 (function() {
     'use strict';
     
+    // Shared by every lookup instead of a fresh literal per call
+    const VAULT_PARAM_RE = /vault=([^&]+)/;
+    const FILE_PARAM_RE = /file=([^&]+)/;
+    
     // Auto-open Obsidian link if present (for 'open' actions)
     function autoOpenObsidianLink() {
-        // Look for obsidian:// links in the page
-        const obsidianLinks = document.querySelectorAll('a[href^="obsidian://"]');
+        // Only the first obsidian:// link is used; querySelector stops the scan there
+        const link = document.querySelector('a[href^="obsidian://"]');
         
-        if (obsidianLinks.length > 0) {
-            const link = obsidianLinks[0];
+        if (link) {
             const url = link.href;
             
             // Add visual feedback
@@ -203,12 +440,12 @@ class HtmlRenderer:
     
     // Helper functions
     function extractVaultFromUrl(url) {
-        const match = url.match(/vault=([^&]+)/);
+        const match = url.match(VAULT_PARAM_RE);
         return match ? decodeURIComponent(match[1]) : 'Unknown';
     }
     
     function extractFileFromUrl(url) {
-        const match = url.match(/file=([^&]+)/);
+        const match = url.match(FILE_PARAM_RE);
         return match ? decodeURIComponent(match[1]) : 'Unknown';
     }
     
@@ -412,15 +649,8 @@ hr {
 """
     
     def _get_theme_css(self) -> str:
-        """Theme-specific CSS"""
-        themes = {
-            "obsidian": self._get_obsidian_theme(),
-            "light": self._get_light_theme(),
-            "dark": self._get_dark_theme(),
-            "minimal": self._get_minimal_theme()
-        }
-        
-        return themes.get(self.theme, themes["obsidian"])
+        """Theme-specific CSS (unknown themes fall back to obsidian)"""
+        return getattr(self, self._THEME_METHODS.get(self.theme, "_get_obsidian_theme"))()
     
     def _get_obsidian_theme(self) -> str:
         """Obsidian-inspired dark theme"""
@@ -762,4 +992,5 @@ hr {
         -webkit-overflow-scrolling: touch;
     }
 }
-"""
\ No newline at end of file
+"""
+
@@ -6,8 +6,52 @@ Convert API responses to Markdown format for HTML display
 from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
-from datetime import datetime
-import json
+from datetime import date, datetime
+from functools import lru_cache
+import re
+
+import orjson
+
+from ..vault import note_name
+
+
+# Backslash first, so the backslashes added for the other characters aren't escaped again
+_MARKDOWN_ESCAPES = tuple(
+    (char, '\\' + char) for char in ['\\', '*', '_', '`', '[', ']', '(', ')', '#', '+', '-', '.', '!']
+)
+# One scan that tells whether any of the above occur; most names, table cells and snippets have none
+_NEEDS_ESCAPE = re.compile(r'[\\*_`\[\]()#+\-.!]').search
+# ASCII unit separator: joins table cells for one batched escape, never produced by escaping
+_CELL_SEP = '\x1f'
+# Names, paths and cell values up to this length are memoized; batched tables are not
+_ESCAPE_CACHE_MAX_LEN = 256
+# The debug dump of an assistant response can embed whole notes; longer dumps are cut here
+_DEBUG_JSON_MAX_CHARS = 16384
+
+
+def _replace_escapes(text: str) -> str:
+    # Chained replace beats str.translate here: each call is a C scan that returns
+    # the same string when the character is absent, and translate is slow on non-ASCII
+    for char, escaped in _MARKDOWN_ESCAPES:
+        text = text.replace(char, escaped)
+    return text
+
+
+@lru_cache(maxsize=4096)
+def _escape_markdown_cached(text: str) -> str:
+    return _replace_escapes(text)
+
+
+def _json_default(obj: Any) -> Any:
+    """orjson fallback for the debug dump of assistant responses"""
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    elif hasattr(obj, '__dict__'):
+        return str(obj)
+    elif hasattr(obj, 'value'):  # Handle enums
+        return obj.value
+    else:
+        return str(obj)
 
 
 class BasePresenter:
@@ -17,24 +61,35 @@ class BasePresenter:
         """Escape markdown special characters"""
         if not text:
             return ""
-        
-        # Escape common markdown characters
-        chars_to_escape = ['*', '_', '`', '\\', '[', ']', '(', ')', '#', '+', '-', '.', '!']
-        for char in chars_to_escape:
-            text = text.replace(char, f'\\{char}')
-        
-        return text
+        if not _NEEDS_ESCAPE(text):
+            return text
+        # The same note names and tags recur across listings, searches and resolves
+        if len(text) <= _ESCAPE_CACHE_MAX_LEN:
+            return _escape_markdown_cached(text)
+        return _replace_escapes(text)
+    
+    def code_span(self, text: str) -> str:
+        """Inline code for literal text such as paths.
+
+        Backslash escapes are shown verbatim inside code spans, so the text is not
+        passed through escape_markdown; a longer fence handles embedded backticks.
+        """
+        if '`' not in text:
+            return f"`{text}`"
+        return f"`` {text} ``"
     
     def format_timestamp(self, timestamp: Optional[str] = None) -> str:
         """Format timestamp for display"""
         if not timestamp:
             timestamp = datetime.now().isoformat()
         
+        # fromisoformat() only accepts a trailing 'Z' from Python 3.11 on
         try:
-            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            return dt.strftime('%Y年%m月%d日 %H:%M')
-        except:
+            iso = timestamp[:-1] + '+00:00' if timestamp.endswith('Z') else timestamp
+            dt = datetime.fromisoformat(iso)
+        except (AttributeError, TypeError, ValueError):
             return timestamp
+        return dt.strftime('%Y年%m月%d日 %H:%M')
 
 
 class FilesPresenter(BasePresenter):
@@ -57,16 +112,13 @@ class FilesPresenter(BasePresenter):
             "|---|----------|------|"
         ])
         
-        for i, file_path in enumerate(files, 1):
-            # Extract filename from path
-            filename = file_path.split('/')[-1] if '/' in file_path else file_path
-            filename = filename.replace('.md', '')  # Remove .md extension
-            
-            # Escape markdown in paths
-            safe_filename = self.escape_markdown(filename)
-            safe_path = self.escape_markdown(file_path)
-            
-            markdown.append(f"| {i} | **{safe_filename}** | `{safe_path}` |")
+        # One row per file: name without folders or .md, and the escaped path
+        escape = self.escape_markdown
+        code = self.code_span
+        markdown.extend(
+            f"| {i} | **{escape(note_name(file_path))}** | {code(file_path)} |"
+            for i, file_path in enumerate(files, 1)
+        )
         
         return "\n".join(markdown)
 
@@ -76,11 +128,10 @@ class SearchPresenter(BasePresenter):
     
     def to_markdown(self, search_results: List[Dict[str, Any]], query: str = "") -> str:
         """Convert search results to Markdown"""
+        query_display = f" '{query}'" if query else ""
         if not search_results:
-            query_display = f" '{query}'" if query else ""
             return f"## 検索結果{query_display}\n\n**該当する結果がありません。**"
         
-        query_display = f" '{query}'" if query else ""
         header = f"## 検索結果{query_display} ({len(search_results)}件)"
         
         markdown = [header, ""]
@@ -92,8 +143,7 @@ class SearchPresenter(BasePresenter):
             score = result.get('score', 0)
             
             # Clean filename
-            filename = file_path.split('/')[-1] if '/' in file_path else file_path
-            filename = filename.replace('.md', '')
+            filename = note_name(file_path)
             
             markdown.append(f"### {i}. {self.escape_markdown(filename)}")
             
@@ -103,7 +153,7 @@ class SearchPresenter(BasePresenter):
             if score:
                 markdown.append(f"**スコア:** {score:.2f}")
             
-            markdown.append(f"**パス:** `{self.escape_markdown(file_path)}`")
+            markdown.append(f"**パス:** {self.code_span(file_path)}")
             
             if snippet:
                 # Format snippet with proper markdown
@@ -128,8 +178,7 @@ class NotePresenter(BasePresenter):
             return f"## ノート: {note_path}\n\n**内容がありません。**"
         
         # Build header
-        filename = note_path.split('/')[-1] if '/' in note_path else note_path
-        filename = filename.replace('.md', '')
+        filename = note_name(note_path)
         
         header = f"## {self.escape_markdown(filename)}"
         if section:
@@ -139,7 +188,7 @@ class NotePresenter(BasePresenter):
         
         # Add metadata
         if note_path:
-            markdown.append(f"**パス:** `{self.escape_markdown(note_path)}`")
+            markdown.append(f"**パス:** {self.code_span(note_path)}")
             markdown.append("")
         
         # Add content (preserve original markdown)
@@ -155,11 +204,10 @@ class ResolvePresenter(BasePresenter):
     
     def to_markdown(self, candidates: List[Dict[str, Any]], query: str = "") -> str:
         """Convert resolution candidates to Markdown"""
+        query_display = f" '{query}'" if query else ""
         if not candidates:
-            query_display = f" '{query}'" if query else ""
             return f"## 候補{query_display}\n\n**該当する候補がありません。**"
         
-        query_display = f" '{query}'" if query else ""
         header = f"## 候補{query_display} ({len(candidates)}件)"
         
         markdown = [header, ""]
@@ -179,9 +227,8 @@ class ResolvePresenter(BasePresenter):
             score_display = f"{score:.2f}" if isinstance(score, (int, float)) else str(score)
             
             safe_name = self.escape_markdown(name)
-            safe_path = self.escape_markdown(path)
             
-            markdown.append(f"| {i} | **{safe_name}** | {score_display} | `{safe_path}` |")
+            markdown.append(f"| {i} | **{safe_name}** | {score_display} | {self.code_span(path)} |")
         
         return "\n".join(markdown)
 
@@ -301,7 +348,7 @@ class AssistantPresenter(BasePresenter):
                 f"**ルーティング理由:** {debug_info}",
                 "",
                 "```json",
-                self._safe_json_dumps(assistant_response),
+                self._debug_json(assistant_response),
                 "```",
                 "",
                 "</details>"
@@ -309,23 +356,22 @@ class AssistantPresenter(BasePresenter):
         
         return "\n".join(markdown)
     
+    def _debug_json(self, obj: Any) -> str:
+        """_safe_json_dumps() cut to _DEBUG_JSON_MAX_CHARS, so it stays cheap to render"""
+        dumped = self._safe_json_dumps(obj)
+        if len(dumped) <= _DEBUG_JSON_MAX_CHARS:
+            return dumped
+        return f"{dumped[:_DEBUG_JSON_MAX_CHARS]}\n... ({len(dumped) - _DEBUG_JSON_MAX_CHARS} chars omitted)"
+    
     def _safe_json_dumps(self, obj: Any) -> str:
         """Safely serialize object to JSON, handling non-serializable types"""
-        import json
-        from datetime import date, datetime
-        
-        def default_serializer(obj):
-            if isinstance(obj, (date, datetime)):
-                return obj.isoformat()
-            elif hasattr(obj, '__dict__'):
-                return str(obj)
-            elif hasattr(obj, 'value'):  # Handle enums
-                return obj.value
-            else:
-                return str(obj)
-        
         try:
-            return json.dumps(obj, indent=2, ensure_ascii=False, default=default_serializer)
+            # Same layout as json.dumps(indent=2, ensure_ascii=False); dates still go through the serializer
+            return orjson.dumps(
+                obj,
+                default=_json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            ).decode()
         except Exception as e:
             return f"{{\"error\": \"Failed to serialize: {str(e)}\"}}"
     
@@ -362,9 +408,8 @@ class AssistantPresenter(BasePresenter):
         directory_files = {}
         
         for file_path in files:
-            if '/' in file_path:
-                directory = file_path.split('/')[0]
-                filename = '/'.join(file_path.split('/')[1:])
+            directory, slash, filename = file_path.partition('/')
+            if slash:
                 if directory not in directory_files:
                     directory_files[directory] = []
                 directory_files[directory].append(filename)
@@ -375,7 +420,7 @@ class AssistantPresenter(BasePresenter):
         if root_files:
             for file_path in sorted(root_files):
                 file_icon = "📄" if file_path.endswith('.md') else "📁"
-                safe_name = self.escape_markdown(file_path.replace('.md', ''))
+                safe_name = self.escape_markdown(file_path.removesuffix('.md'))
                 markdown.append(f"- {file_icon} **{safe_name}**")
         
         # Display directory files
@@ -386,7 +431,7 @@ class AssistantPresenter(BasePresenter):
             
             for filename in sorted(directory_files[directory]):
                 file_icon = "📄" if filename.endswith('.md') else "📁"
-                safe_name = self.escape_markdown(filename.replace('.md', ''))
+                safe_name = self.escape_markdown(filename.removesuffix('.md'))
                 markdown.append(f"  - {file_icon} {safe_name}")
         
         markdown.append("")
@@ -406,7 +451,7 @@ class AssistantPresenter(BasePresenter):
             file_path = result.get('file', '')
             matches = result.get('matches', [])
             
-            safe_name = self.escape_markdown(file_path.replace('.md', ''))
+            safe_name = self.escape_markdown(file_path.removesuffix('.md'))
             markdown.append(f"**{i}. {safe_name}** ({len(matches)}件の一致)")
             
             # Show first match snippet
@@ -430,7 +475,7 @@ class AssistantPresenter(BasePresenter):
             return
         
         # Extract filename
-        filename = note_path.split('/')[-1].replace('.md', '') if note_path else 'ノート'
+        filename = note_name(note_path) if note_path else 'ノート'
         safe_name = self.escape_markdown(filename)
         
         markdown.extend([
@@ -476,7 +521,7 @@ class AssistantPresenter(BasePresenter):
         
         # Add file info if available
         if open_path:
-            filename = open_path.split('/')[-1].replace('.md', '')
+            filename = note_name(open_path)
             safe_name = self.escape_markdown(filename)
             markdown.extend([
                 f"### 📄 {safe_name}",
@@ -527,8 +572,7 @@ class TablePresenter(BasePresenter):
         
         header = f"## テーブル抽出 ({len(tables)}件)"
         if source_file:
-            filename = source_file.split('/')[-1] if '/' in source_file else source_file
-            header += f" - {filename.replace('.md', '')}"
+            header += f" - {note_name(source_file)}"
         
         markdown = [header, ""]
         
@@ -547,27 +591,41 @@ class TablePresenter(BasePresenter):
                 markdown.append(header_row)
                 markdown.append(separator)
                 
-                for row in rows:
-                    if len(row) == len(headers):
-                        escaped_row = [self.escape_markdown(str(cell)) for cell in row]
-                        row_md = "| " + " | ".join(escaped_row) + " |"
-                        markdown.append(row_md)
+                for escaped_row in self._escape_rows(rows, len(headers)):
+                    row_md = "| " + " | ".join(escaped_row) + " |"
+                    markdown.append(row_md)
             
             markdown.append("")  # Add spacing between tables
         
         return "\n".join(markdown)
+    
+    def _escape_rows(self, rows: List[List[Any]], width: int) -> List[List[str]]:
+        """Escape the cells of every row with `width` cells; other rows are dropped"""
+        rows = [row for row in rows if len(row) == width]
+        cells = [str(cell) for row in rows for cell in row]
+        if not cells:
+            return []
+        # Escape the whole table in one pass and split it back; a cell holding the
+        # separator itself changes the count, so fall back to escaping cell by cell
+        escaped = self.escape_markdown(_CELL_SEP.join(cells)).split(_CELL_SEP)
+        if len(escaped) != len(cells):
+            escaped = [self.escape_markdown(cell) for cell in cells]
+        return [escaped[i:i + width] for i in range(0, len(escaped), width)]
+
+
+# Presenters hold no state, so one instance of each serves every request
+_PRESENTERS = {
+    'files': FilesPresenter(),
+    'search': SearchPresenter(),
+    'note': NotePresenter(),
+    'resolve': ResolvePresenter(),
+    'assistant': AssistantPresenter(),
+    'table': TablePresenter(),
+}
+_DEFAULT_PRESENTER = BasePresenter()
 
 
 # Factory function for easy access
 def create_presenter(content_type: str) -> BasePresenter:
-    """Create appropriate presenter for content type"""
-    presenters = {
-        'files': FilesPresenter(),
-        'search': SearchPresenter(),
-        'note': NotePresenter(),
-        'resolve': ResolvePresenter(),
-        'assistant': AssistantPresenter(),
-        'table': TablePresenter(),
-    }
-    
-    return presenters.get(content_type, BasePresenter())
\ No newline at end of file
+    """Return the presenter for a content type"""
+    return _PRESENTERS.get(content_type, _DEFAULT_PRESENTER)
\ No newline at end of file
@@ -1,7 +1,13 @@
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 import re
+import time
+from .cache import LRUCache
 from .commands import load_commands, match_command
-from .search import grep_vault
+from .file_index import vault_generation
+from .search import grep_vault, grep_vault_first
+from .vault import vault_signature
 from .models import ResolveResult
 from .logging_utils import setup_orchestrator_logger
 
@@ -14,22 +20,80 @@ except Exception:
     logger = logging.getLogger("resolver")
 
 
+# .mdファイル名パターン / 除外するアクション語
+_MD_NAME_RE = re.compile(r'([^\s]+\.md)', re.IGNORECASE)
+_WORD_RE = re.compile(r'\S+')
+_ACTION_WORDS = frozenset({'開', '開く', 'open', '表示', '要約', 'summary', 'まとめ', 'ノート', '全文', '本文', 'table', '表', '一覧'})
+
+
 def _extract_search_terms(query: str) -> list[str]:
     """クエリから検索に有効なキーワードを抽出"""
     # .mdファイル名パターンを優先抽出
-    md_pattern = r'([^\s]+\.md)'
-    md_matches = re.findall(md_pattern, query, re.IGNORECASE)
+    md_matches = _MD_NAME_RE.findall(query)
     if md_matches:
         return md_matches
     
     # 一般的なキーワード抽出（アクション語を除外）
-    action_words = {'開', '開く', 'open', '表示', '要約', 'summary', 'まとめ', 'ノート', '全文', '本文', 'table', '表', '一覧'}
-    words = re.findall(r'\S+', query)
-    keywords = [w for w in words if w.lower() not in action_words]
+    words = _WORD_RE.findall(query)
+    keywords = [w for w in words if w.lower() not in _ACTION_WORDS]
     
     return keywords if keywords else [query]
 
+# Resolutions keyed on the query plus versions of everything they read.
+# Without a file watcher the vault version is the mtime of its root and top-level folders,
+# which sees notes created or removed there at once; deeper changes and edits to note
+# contents are only picked up once the TTL bucket rolls over, so misses aren't kept.
+_RESOLVE_CACHE = LRUCache(maxsize=1024)
+RESOLVE_CACHE_TTL = 30.0
+
+
+def clear_resolve_cache() -> None:
+    _RESOLVE_CACHE.clear()
+    _load_commands_cached.cache_clear()
+
+
+@lru_cache(maxsize=8)
+def _load_commands_cached(commands_file: str, mtime_ns: int) -> tuple:
+    """commands.yml parsed once per modification time"""
+    return tuple(load_commands(Path(commands_file)))
+
+
+def _get_commands(commands_file: Path) -> tuple:
+    try:
+        mtime_ns = commands_file.stat().st_mtime_ns
+    except OSError:
+        return ()  # load_commands() also yields nothing for a missing file
+    return _load_commands_cached(str(commands_file), mtime_ns)
+
+
 def resolve_query(query: str, vault_root: Path, commands_file: Path, prefer: str = "most_hits") -> ResolveResult:
+    """resolve_query_uncached() memoized on commands.yml mtime and the vault's change generation"""
+    try:
+        commands_mtime = commands_file.stat().st_mtime_ns
+    except OSError:
+        commands_mtime = None
+    generation = vault_generation(vault_root)
+    watched = generation is not None
+    if not watched:
+        try:
+            signature = vault_signature(vault_root)
+        except OSError:
+            signature = None
+        generation = ("ttl", signature, int(time.monotonic() // RESOLVE_CACHE_TTL))
+    key = (query, prefer, str(vault_root), str(commands_file), commands_mtime, generation)
+    
+    result = _RESOLVE_CACHE.get(key)
+    if result is not None:
+        logger.debug(f"♻️ Cached resolution for '{query}': {result.open_path}")
+        return result
+    result = resolve_query_uncached(query, vault_root, commands_file, prefer)
+    # A note created in a subfolder would stay "not found" for the whole TTL bucket
+    if watched or result.found:
+        _RESOLVE_CACHE.put(key, result)
+    return result
+
+
+def resolve_query_uncached(query: str, vault_root: Path, commands_file: Path, prefer: str = "most_hits") -> ResolveResult:
     """
     クエリを解決してObsidianファイルパスを特定する
     
@@ -42,7 +106,7 @@ def resolve_query(query: str, vault_root: Path, commands_file: Path, prefer: str
     logger.debug(f"🔍 Starting query resolution: '{query}' with prefer='{prefer}'")
     
     # Step 1: 事前定義されたコマンドから検索
-    commands = load_commands(commands_file)
+    commands = _get_commands(commands_file)
     cmd = match_command(query, commands)
     if cmd:
         logger.info(f"✅ Command match found: {cmd.open.path}")
@@ -61,11 +125,10 @@ def resolve_query(query: str, vault_root: Path, commands_file: Path, prefer: str
     if not hits:
         search_terms = _extract_search_terms(query)
         logger.debug(f"🔍 No hits with original query, trying extracted terms: {search_terms}")
-        for term in search_terms:
-            hits = grep_vault(vault_root, term, limit=200)
-            if hits:
-                logger.debug(f"✅ Found {len(hits)} hits with term: '{term}'")
-                break
+        # One pass over the vault for all terms; the first term with hits wins
+        term, hits = grep_vault_first(vault_root, search_terms, limit=200)
+        if hits:
+            logger.debug(f"✅ Found {len(hits)} hits with term: '{term}'")
     else:
         logger.debug(f"✅ Found {len(hits)} hits with original query")
     
@@ -73,9 +136,7 @@ def resolve_query(query: str, vault_root: Path, commands_file: Path, prefer: str
         logger.warning(f"❌ No hits found for query: '{query}'")
         return ResolveResult(found=False, reason="no hits")
 
-    counts = {}
-    for h in hits:
-        counts[h["path"]] = counts.get(h["path"], 0) + 1
+    counts = Counter(h["path"] for h in hits)
 
     candidates = list(counts.items())
     if prefer == "shortest":
@@ -25,6 +25,17 @@ class RoutingDecision:
     reason: Optional[str] = None
 
 
+# Fallback intent for each primary intent
+_FALLBACK_INTENTS = {
+    Intent.OPEN: Intent.SEARCH,      # open -> search
+    Intent.READ: Intent.SEARCH,      # read -> search
+    Intent.SUMMARIZE: Intent.READ,   # summarize -> read
+    Intent.COMMENT: Intent.READ,     # comment -> read
+    Intent.UPDATE: Intent.READ,      # update -> read
+    Intent.TABLE: Intent.SEARCH,     # table -> search (for file listings)
+}
+
+
 @dataclass(frozen=True) 
 class RoutingPolicy:
     """Policy class for determining how to handle intent classification results.
@@ -82,15 +93,7 @@ class RoutingPolicy:
     
     def _get_fallback_intent(self, intent: Intent) -> Optional[Intent]:
         """Define fallback intents for each primary intent."""
-        fallback_map = {
-            Intent.OPEN: Intent.SEARCH,      # open -> search
-            Intent.READ: Intent.SEARCH,      # read -> search  
-            Intent.SUMMARIZE: Intent.READ,   # summarize -> read
-            Intent.COMMENT: Intent.READ,     # comment -> read
-            Intent.UPDATE: Intent.READ,      # update -> read
-            Intent.TABLE: Intent.SEARCH,     # table -> search (for file listings)
-        }
-        return fallback_map.get(intent)
+        return _FALLBACK_INTENTS.get(intent)
     
     def should_attempt_fallback(self, 
                                original_intent: Intent, 
@@ -1,20 +1,121 @@
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import re
 
+from .cache import LRUCache
+from .file_index import indexed_md_files, vault_generation
+from .vault import list_md_files
+
+# Dedicated readers so a scan can overlap file reads without borrowing the request pool
+_READ_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="vault-read")
+# Reads are issued in batches that start small (early hits stop the scan cheaply)
+# and double up to the maximum as the scan goes on
+_MIN_READ_BATCH = 8
+_MAX_READ_BATCH = 64
+
+# Note texts keyed by path -> (generation, mtime_ns, size, text), kept only while a file
+# watcher runs. Texts from the current generation are reused without touching the disk;
+# after any change one stat() per file tells which to read again. Without a watcher a
+# stat() per file costs about as much as reading it from the page cache, so none are kept.
+_TEXT_CACHE = LRUCache(maxsize=8192)  # vaults with more notes than this aren't cached
+_TEXT_CACHE_MAX_CHARS = 64 * 1024  # bigger notes are read each time to keep the cache small
+
+def invalidate_search_text(md: Path) -> None:
+    """Forget a cached text after writing the note (mtime alone can be too coarse)."""
+    _TEXT_CACHE.pop(str(md))
+
+def clear_search_cache() -> None:
+    _TEXT_CACHE.clear()
+
+def _read_md(md: Path) -> str | None:
+    try:
+        return md.read_text(encoding="utf-8", errors="ignore")
+    except Exception:
+        return None
+
+def _reread_md(md: Path, generation: int) -> str | None:
+    """Read a note whose cached text is missing or from an older generation"""
+    key = str(md)
+    cached = _TEXT_CACHE.get(key)
+    try:
+        st = md.stat()
+        if cached is not None and cached[1] == st.st_mtime_ns and cached[2] == st.st_size:
+            text = cached[3]
+        else:
+            text = md.read_text(encoding="utf-8", errors="ignore")
+    except Exception:
+        return None
+    if len(text) <= _TEXT_CACHE_MAX_CHARS:
+        _TEXT_CACHE.put(key, (generation, st.st_mtime_ns, st.st_size, text))
+    return text
+
+def _texts(chunk: list[Path], generation: int | None) -> list[str | None]:
+    if generation is None:
+        return list(_READ_POOL.map(_read_md, chunk))
+    texts = []
+    stale = []
+    for i, md in enumerate(chunk):
+        cached = _TEXT_CACHE.get(str(md))
+        if cached is not None and cached[0] == generation:
+            texts.append(cached[3])
+        else:
+            texts.append(None)
+            stale.append(i)
+    if stale:
+        reread = _READ_POOL.map(_reread_md, [chunk[i] for i in stale], [generation] * len(stale))
+        for i, text in zip(stale, reread):
+            texts[i] = text
+    return texts
+
+def _iter_texts(vault_root: Path, files: list[str], generation: int | None = None):
+    """Yield (relative path, text) in order while reading ahead in concurrent batches"""
+    if len(files) > _TEXT_CACHE.maxsize:
+        generation = None  # a scan longer than the LRU would only evict its own entries
+    batch = _MIN_READ_BATCH
+    start = 0
+    while start < len(files):
+        chunk = files[start:start + batch]
+        yield from zip(chunk, _texts([vault_root / rel for rel in chunk], generation))
+        start += batch
+        batch = min(batch * 2, _MAX_READ_BATCH)
+
+def _vault_files(vault_root: Path) -> list[str]:
+    """Vault-relative .md paths, from the live index when one covers the vault"""
+    indexed = indexed_md_files(vault_root)
+    if indexed is not None:
+        return indexed[0]
+    return list_md_files(vault_root)
+
+def _contains(q: str):
+    """Case-insensitive substring test for `q`, same results as re.IGNORECASE"""
+    search = re.compile(re.escape(q), re.IGNORECASE).search
+    if not q.isascii():
+        return lambda text: search(text) is not None
+    q_lower = q.lower()
+
+    def contains(text: str) -> bool:
+        # ASCII on both sides: lower() folds exactly like the regex and `in` is a fast
+        # substring scan; non-ASCII text may hold folds like 'ſ' ~ 's', so use the regex
+        if text.isascii():
+            return q_lower in text.lower()
+        return search(text) is not None
+
+    return contains
+
 def grep_vault(vault_root: Path, query: str, limit: int = 30) -> list[dict]:
     q = (query or "").strip()
     if not q:
         return []
-    
+
     hits = []
-    
+    generation = vault_generation(vault_root)
+    files = _vault_files(vault_root)
+
     # 1) ファイル名検索を追加
-    for md in vault_root.rglob("*.md"):
-        if not md.is_file():
-            continue
-        rel_path = str(md.relative_to(vault_root)).replace("\\", "/")
-        if q.lower() in rel_path.lower():
+    q_lower = q.lower()
+    for rel_path in files:
+        if q_lower in rel_path.lower():
             hits.append({
                 "path": rel_path,
                 "line_no": 0,  # ファイル名マッチを示す
@@ -22,23 +123,74 @@ def grep_vault(vault_root: Path, query: str, limit: int = 30) -> list[dict]:
             })
             if len(hits) >= limit:
                 return hits
-    
+
     # 2) 既存の内容検索
-    pat = re.compile(re.escape(q), re.IGNORECASE)
-    for md in vault_root.rglob("*.md"):
-        if not md.is_file():
-            continue
-        try:
-            text = md.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
+    contains = _contains(q)
+    for rel_path, text in _iter_texts(vault_root, files, generation):
+        # Most files don't match at all; only split the ones that do into lines
+        if text is None or not contains(text):
             continue
         for idx, line in enumerate(text.splitlines(), start=1):
-            if pat.search(line):
+            if contains(line):
                 hits.append({
-                    "path": str(md.relative_to(vault_root)).replace("\\", "/"),
+                    "path": rel_path,
                     "line_no": idx,
                     "line": line.strip()
                 })
                 if len(hits) >= limit:
                     return hits
     return hits
+
+def grep_vault_first(vault_root: Path, terms: list[str], limit: int = 30) -> tuple[str | None, list[dict]]:
+    """(term, hits) for the first term with any hits, reading the vault once.
+
+    Same hits as calling grep_vault() per term in order and stopping at the
+    first non-empty result, without a full scan per term.
+    """
+    terms = [t for t in ((t or "").strip() for t in terms) if t]
+    if not terms:
+        return None, []
+    generation = vault_generation(vault_root)
+    files = _vault_files(vault_root)
+    results: list[list[dict]] = [[] for _ in terms]
+    # Terms still being searched: a later term can't win once an earlier one has hits,
+    # and a term stops at `limit` hits just like grep_vault()
+    active = list(range(len(terms)))
+
+    def settle() -> None:
+        winner = next((i for i in active if results[i]), None)
+        if winner is not None:
+            active[:] = [i for i in active if i < winner or (i == winner and len(results[i]) < limit)]
+
+    # 1) ファイル名検索
+    lowered = [t.lower() for t in terms]
+    for rel_path in files:
+        rel_lower = rel_path.lower()
+        for i in active:
+            if lowered[i] in rel_lower:
+                results[i].append({"path": rel_path, "line_no": 0, "line": f"[FileName Match: {rel_path}]"})
+        settle()
+        if not active:
+            break
+
+    # 2) 内容検索
+    pats = [_contains(t) for t in terms]
+    if active:
+        for rel_path, text in _iter_texts(vault_root, files, generation):
+            if text is None:
+                continue
+            matching = [i for i in active if pats[i](text)]
+            if not matching:
+                continue
+            for idx, line in enumerate(text.splitlines(), start=1):
+                for i in matching:
+                    if len(results[i]) < limit and pats[i](line):
+                        results[i].append({"path": rel_path, "line_no": idx, "line": line.strip()})
+            settle()
+            if not active:
+                break
+
+    for term, hits in zip(terms, results):
+        if hits:
+            return term, hits
+    return None, []
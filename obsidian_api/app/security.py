@@ -1,8 +1,11 @@
+import hmac
+
 from fastapi import Header, HTTPException
 from .config import settings
 
 def require_api_key(x_api_key: str | None = Header(default=None, alias="X-API-Key")):
     if not settings.api_key:
         return
-    if x_api_key != settings.api_key:
+    # Constant-time compare so response timing doesn't reveal how much of a guess was right
+    if x_api_key is None or not hmac.compare_digest(x_api_key.encode(), settings.api_key.encode()):
         raise HTTPException(status_code=401, detail="Invalid API key")
@@ -1,12 +1,30 @@
 import re
+from functools import lru_cache
 from typing import List
 
+# Header row, separator row, then body rows; each part stays on its own line, so a long
+# run of pipe-led lines that never forms a table is rejected in linear time
 TABLE_BLOCK_RE = re.compile(
-    r"(?:^|\n)(\|.*?\|\n\|[-:| ]+\|\n(?:\|.*?\|\n?)+)",
-    re.S
+    r"^(\|[^\n]*\|[ \t]*\n\|[-:| ]+\|[ \t]*\n(?:\|[^\n]*\|[ \t]*(?:\n|$))+)",
+    re.M
 )
 
 def extract_tables(markdown: str) -> List[str]:
     if not markdown:
         return []
     return [m.group(1).strip() for m in TABLE_BLOCK_RE.finditer(markdown)]
+
+_TABLES_MEMO_MAX_CHARS = 64 * 1024
+
+def extract_tables_cached(markdown: str) -> tuple[str, ...]:
+    """extract_tables memoized on the note text; texts from read_note are shared objects.
+
+    Large texts are scanned each time rather than pinned in the memo.
+    """
+    if len(markdown) > _TABLES_MEMO_MAX_CHARS:
+        return tuple(extract_tables(markdown))
+    return _extract_tables_memo(markdown)
+
+@lru_cache(maxsize=256)
+def _extract_tables_memo(markdown: str) -> tuple[str, ...]:
+    return tuple(extract_tables(markdown))
@@ -1,56 +1,152 @@
 from __future__ import annotations
+import os
+from functools import lru_cache
 from pathlib import Path
 import re
 import yaml
 
+from .cache import LRUCache
+
+# libyaml's loader when PyYAML was built with it (the usual wheels are); same results, ~8x faster
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+@lru_cache(maxsize=8)
+def _resolved_root(root: Path) -> str:
+    return str(root.resolve())
+
 def safe_join(root: Path, rel_path: str) -> Path:
     rel_path = rel_path.strip().lstrip("/").replace("\\", "/")
+    # The target is resolved on every call so a swapped symlink can't slip past the check
     p = (root / rel_path).resolve()
-    if not str(p).startswith(str(root.resolve())):
+    resolved_root = _resolved_root(root)
+    target = str(p)
+    # Compare whole path components: "/srv/Vault2" must not pass as inside "/srv/Vault"
+    if target != resolved_root and not target.startswith(resolved_root.rstrip(os.sep) + os.sep):
         raise ValueError("Path traversal detected")
     return p
 
 def list_md_files(root: Path) -> list[str]:
+    """Vault-relative paths of all .md files, in the same order root.rglob("*.md") yields them.
+
+    os.scandir entries carry their file type, so unlike rglob + is_file() this needs
+    no Path object or stat() per entry. Symlinked folders are not descended, as with rglob.
+    """
     out = []
-    for p in root.rglob("*.md"):
-        if p.is_file():
-            out.append(str(p.relative_to(root)).replace("\\", "/"))
+    stack = [(str(root), "")]
+    while stack:
+        path, prefix = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            # Unreadable, missing, or removed mid-walk: skip it, as rglob does
+            continue
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.name.endswith(".md") and entry.is_file():
+                    out.append(prefix + entry.name)
+                elif entry.is_dir() and not entry.is_symlink():
+                    subdirs.append((entry.path, prefix + entry.name + "/"))
+            except OSError:
+                continue
+        # Depth-first, folders in directory order
+        stack.extend(reversed(subdirs))
     return out
 
+def vault_signature(root: Path) -> float:
+    """Latest mtime of the vault root and its top-level folders"""
+    latest = os.stat(root).st_mtime
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                latest = max(latest, entry.stat().st_mtime)
+    return latest
+
+def note_name(path: str) -> str:
+    """Display name of a vault path: last segment without the .md extension"""
+    return path.rpartition("/")[2].removesuffix(".md")
+
 FRONTMATTER_RE = re.compile(r"\A---\s*\n(.*?)\n---\s*\n", re.S)
 
 def parse_frontmatter(text: str) -> tuple[dict, str]:
-    m = FRONTMATTER_RE.search(text)
+    # Notes without a leading fence skip the regex (and its scan for a closing one)
+    if not text.startswith("---"):
+        return {}, text
+    m = FRONTMATTER_RE.match(text)
     if not m:
         return {}, text
     fm_raw = m.group(1)
     body = text[m.end():]
     try:
-        data = yaml.safe_load(fm_raw) or {}
+        data = yaml.load(fm_raw, Loader=_YAML_LOADER) or {}
         if not isinstance(data, dict):
             data = {}
     except Exception:
         data = {}
     return data, body
 
+# Parsed notes keyed by path -> (mtime_ns, size, text, frontmatter, body)
+_NOTE_CACHE = LRUCache(maxsize=512)
+_NOTE_CACHE_MAX_BYTES = 64 * 1024  # bigger notes are re-read each time to keep the cache small
+
+def read_note(p: Path, st: os.stat_result | None = None) -> tuple[str, dict, str]:
+    """Read a note as (text, frontmatter, body), reusing the parse while the file is unchanged.
+
+    Pass `st` when the caller already has the file's stat result.
+    """
+    if st is None:
+        st = p.stat()
+    key = str(p)
+    cached = _NOTE_CACHE.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2:]
+    text = p.read_text(encoding="utf-8", errors="ignore")
+    fm, body = parse_frontmatter(text)
+    if st.st_size <= _NOTE_CACHE_MAX_BYTES:
+        _NOTE_CACHE.put(key, (st.st_mtime_ns, st.st_size, text, fm, body))
+    else:
+        _NOTE_CACHE.pop(key)
+    return text, fm, body
+
+def invalidate_note(p: Path) -> None:
+    """Forget a cached note after writing it (mtime alone can be too coarse)."""
+    _NOTE_CACHE.pop(str(p))
+
+def clear_note_cache() -> None:
+    """Forget every cached note and extracted section."""
+    _NOTE_CACHE.clear()
+    _extract_section_memo.cache_clear()
+
+# Headings anywhere in a note; [^\S\n] keeps the gap after the hashes on the heading's own line
+HEADING_RE = re.compile(r"^(#{1,6})[^\S\n]+(.*)$", re.M)
+
+_SECTION_MEMO_MAX_CHARS = 64 * 1024
+
+def extract_section_cached(body: str, heading: str) -> str | None:
+    """extract_section memoized on (body, heading); bodies from read_note are shared objects.
+
+    Large bodies are scanned each time rather than pinned in the memo.
+    """
+    if len(body) > _SECTION_MEMO_MAX_CHARS:
+        return extract_section(body, heading)
+    return _extract_section_memo(body, heading)
+
+@lru_cache(maxsize=1024)
+def _extract_section_memo(body: str, heading: str) -> str | None:
+    return extract_section(body, heading)
+
 def extract_section(markdown: str, heading: str) -> str | None:
-    lines = markdown.splitlines()
-    start_idx = None
+    # One regex scan over the note, slicing the section out instead of splitting every line
+    start = None
     start_level = None
-    pat = re.compile(r"^(#{1,6})\s+(.*)\s*$")
-    for i, ln in enumerate(lines):
-        m = pat.match(ln)
-        if m and m.group(2) == heading:
-            start_idx = i
-            start_level = len(m.group(1))
-            break
-    if start_idx is None:
+    for m in HEADING_RE.finditer(markdown):
+        if start is None:
+            if m.group(2) == heading:
+                start = m.end()
+                start_level = len(m.group(1))
+        elif len(m.group(1)) <= start_level:
+            return markdown[start:m.start()].strip()
+    if start is None:
         return None
-
-    buf = []
-    for j in range(start_idx + 1, len(lines)):
-        m = pat.match(lines[j])
-        if m and len(m.group(1)) <= start_level:
-            break
-        buf.append(lines[j])
-    return "\n".join(buf).strip()
+    return markdown[start:].strip()
@@ -146,6 +146,13 @@ class TestNoteEndpoint:
         headers = {"X-API-Key": api_key}
         response = client.get("/note?path=test_note.md&section=Nonexistent Section", headers=headers)
         assert response.status_code == 404
+    
+    def test_note_not_modified(self, api_key):
+        headers = {"X-API-Key": api_key}
+        response = client.get("/note?path=test_note.md", headers=headers)
+        etag = response.headers["etag"]
+        response = client.get("/note?path=test_note.md", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
 
 class TestResolveEndpoint:
     def test_resolve_without_api_key(self):
@@ -184,6 +191,18 @@ class TestAssistantEndpoint:
         response = client.get("/assistant?q=test&vault=TestVault", headers=headers)
         assert response.status_code == 200
 
+class TestHtmlTestView:
+    def test_view_returns_etag(self):
+        response = client.get("/test/html/view?theme=light&mobile=false")
+        assert response.status_code == 200
+        assert "ETag" in response.headers
+    
+    def test_view_not_modified(self):
+        etag = client.get("/test/html/view?theme=light").headers["ETag"]
+        response = client.get("/test/html/view?theme=light", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
 class TestSecurity:
     def test_invalid_api_key(self):
         headers = {"X-API-Key": "invalid-key"}
@@ -193,6 +212,19 @@ class TestSecurity:
     def test_missing_api_key_header(self):
         response = client.get("/files")
         assert response.status_code == 401
+    
+    def test_sibling_directory_traversal(self, temp_vault, api_key):
+        # A sibling whose name starts with the vault's must not count as inside it
+        sibling = temp_vault.parent / (temp_vault.name + "2")
+        sibling.mkdir()
+        try:
+            (sibling / "secret.md").write_text("secret", encoding="utf-8")
+            headers = {"X-API-Key": api_key}
+            response = client.get(f"/note?path=../{sibling.name}/secret.md", headers=headers)
+            assert response.status_code == 400
+        finally:
+            (sibling / "secret.md").unlink()
+            sibling.rmdir()
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -80,6 +80,10 @@ def test_presenters():
     files_md = files_presenter.to_markdown(files_data, "TestVault")
     assert "ファイル一覧" in files_md
     assert "部品" in files_md
+    # Each special character gets exactly one backslash
+    assert files_presenter.escape_markdown("my_note*1.md") == "my\\_note\\*1\\.md"
+    # Paths sit in code spans, where escapes would show up verbatim
+    assert "`folder/note2.md`" in files_md
     print("  ✅ Files presenter working")
     
     # Test Search Presenter  
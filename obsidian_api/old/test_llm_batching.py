@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+from app.llm_classifier import BatchingLLMClassifier
+
+
+class FakeClassifier:
+    """Stands in for LLMIntentClassifier; records every call it receives"""
+
+    def __init__(self, delay=0.0, fail_batches=False):
+        self.delay = delay
+        self.fail_batches = fail_batches
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def classify(self, text):
+        with self.lock:
+            self.calls.append(("single", [text]))
+        time.sleep(self.delay)
+        return (f"single:{text}", None)
+
+    def classify_batch(self, texts):
+        with self.lock:
+            self.calls.append(("batch", list(texts)))
+        time.sleep(self.delay)
+        if self.fail_batches:
+            raise RuntimeError("provider error")
+        return [(f"batch:{text}", None) for text in texts]
+
+
+def run_concurrently(batcher, texts):
+    results = {}
+    start = threading.Barrier(len(texts))
+
+    def worker(text):
+        start.wait()
+        results[text] = batcher.classify(text)
+
+    threads = [threading.Thread(target=worker, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results
+
+
+class TestBatchingLLMClassifier:
+    def test_results_follow_input_order(self):
+        fake = FakeClassifier()
+        batcher = BatchingLLMClassifier(fake, max_batch=4, window_seconds=1.0)
+        texts = ["a", "b", "c", "d"]
+        results = run_concurrently(batcher, texts)
+        # A full batch goes out at once, and each caller gets the result at its own position
+        assert [kind for kind, _ in fake.calls] == ["batch"]
+        assert sorted(fake.calls[0][1]) == texts
+        assert results == {text: (f"batch:{text}", None) for text in texts}
+
+    def test_failed_batch_falls_back_per_query(self):
+        fake = FakeClassifier(fail_batches=True)
+        batcher = BatchingLLMClassifier(fake, max_batch=2, window_seconds=1.0)
+        results = run_concurrently(batcher, ["x", "y"])
+        assert results == {"x": ("single:x", None), "y": ("single:y", None)}
+        assert sorted(texts for kind, texts in fake.calls if kind == "single") == [["x"], ["y"]]
+
+    def test_leader_stops_after_its_own_batch(self):
+        fake = FakeClassifier(delay=0.1)
+        batcher = BatchingLLMClassifier(fake, max_batch=2, window_seconds=0.01)
+        calls_when_leader_returned = []
+
+        def leader():
+            batcher.classify("leader")
+            calls_when_leader_returned.append(len(fake.calls))
+
+        leader_thread = threading.Thread(target=leader)
+        leader_thread.start()
+        # Wait until the leader's query is in flight, then pile up later queries
+        deadline = time.monotonic() + 5
+        while not fake.calls and time.monotonic() < deadline:
+            time.sleep(0.001)
+        others = [threading.Thread(target=batcher.classify, args=(f"q{i}",)) for i in range(20)]
+        for thread in others:
+            thread.start()
+        leader_thread.join(timeout=5)
+        for thread in others:
+            thread.join(timeout=5)
+
+        # The leader answered its own query only; the backlog was drained by the others
+        assert calls_when_leader_returned == [1]
+        answered = [text for _, texts in fake.calls for text in texts]
+        assert sorted(answered) == sorted(["leader"] + [f"q{i}" for i in range(20)])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])